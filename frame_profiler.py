@@ -0,0 +1,196 @@
+import atexit
+import csv
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import pygame
+
+# 게임 루프의 프레임 시간을 단계별로 재는 선택형 프로파일러입니다. 여러 pygame 게임이 함께 씁니다.
+# 꺼져 있으면 begin_frame()/mark()가 바로 돌아오므로 루프에 그대로 두어도 됩니다.
+#
+# 켜는 법: 환경 변수 GAME_PROFILE=1 또는 실행 인자 --profile
+#   GAME_PROFILE=파일 또는 --profile 파일 이면 끝날 때 프레임 기록을 내보냅니다.
+#   확장자가 .json이면 Chrome trace 형식(chrome://tracing, Perfetto), 그 밖에는 CSV입니다.
+#   tracemalloc으로 프레임마다 할당량도 잽니다. 할당 추적은 시간 측정을 느리게 하므로 GAME_PROFILE_ALLOC=0으로 끌 수 있습니다.
+
+PHASES = ("input", "update", "collision", "draw", "flip", "wait") # wait는 clock.tick에서 쉬는 시간
+HUD_WINDOW = 300 # HUD 백분위를 구할 최근 프레임 수
+HUD_REFRESH = 15 # HUD 글자를 다시 만드는 간격(프레임)
+HUD_WIDTH = 300
+HUD_FONT_SIZE = 20
+HUD_COLOR = (255, 255, 255)
+HUD_BACKGROUND = (0, 0, 0)
+
+
+def percentile(sorted_values, q):
+    """정렬된 목록의 q(0~1) 백분위 값"""
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class FrameProfiler:
+    """프레임마다 단계별 시간과 할당량을 모읍니다.
+
+    루프 맨 앞에서 begin_frame()을, 각 단계가 끝날 때마다 mark(단계)를 부릅니다.
+    mark는 직전 표시 이후의 시간을 그 단계에 더하므로, 같은 단계를 한 프레임에 여러 번 표시해도 됩니다.
+    """
+    def __init__(self, name, enabled=False, export_path=None, track_allocations=True):
+        self.name = name
+        self.enabled = enabled
+        self.export_path = export_path
+        self.track_allocations = enabled and track_allocations
+        self.frames = 0
+        self.recent = deque(maxlen=HUD_WINDOW) # (프레임 ms, 작업 ms, 단계별 ms, 최대 할당 KB)
+        self.records = [] # 내보낼 때만 쌓습니다.
+        self.frame_start = None
+        self.last_mark = None
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.segments = []
+        self.memory_start = 0
+        self.origin = time.perf_counter()
+        self.hud = None
+        self.font = None
+        self.closed = False
+        if enabled:
+            if self.track_allocations and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            atexit.register(self.close)
+
+    # --- 측정 ---
+    def begin_frame(self):
+        """앞 프레임을 마감하고 새 프레임을 시작합니다."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self._end_frame(now)
+        self.frame_start = self.last_mark = now
+        self.phase_times = dict.fromkeys(PHASES, 0.0)
+        self.segments = []
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+
+    def mark(self, phase):
+        """직전 표시(또는 프레임 시작) 이후의 시간을 phase 단계에 더합니다."""
+        if self.frame_start is None:
+            return
+        now = time.perf_counter()
+        self.phase_times[phase] += now - self.last_mark
+        if self.export_path:
+            self.segments.append((phase, self.last_mark, now - self.last_mark))
+        self.last_mark = now
+
+    def _end_frame(self, now):
+        total = now - self.frame_start
+        phases = self.phase_times
+        net = peak = 0
+        if self.track_allocations:
+            current, peak_bytes = tracemalloc.get_traced_memory()
+            net, peak = current - self.memory_start, peak_bytes - self.memory_start
+        self.frames += 1
+        self.recent.append((total * 1000, (total - phases["wait"]) * 1000,
+                            tuple(phases[p] * 1000 for p in PHASES), peak / 1024))
+        if self.export_path:
+            self.records.append((self.frame_start, total, tuple(phases[p] for p in PHASES), net, peak, self.segments))
+
+    # --- 화면 표시 ---
+    def draw_hud(self, surface):
+        """최근 프레임의 p50/p99를 화면 왼쪽 아래에 그리고, 그린 영역을 돌려줍니다. 꺼져 있으면 None."""
+        if not self.enabled:
+            return None
+        if self.hud is None or self.frames % HUD_REFRESH == 0:
+            self.hud = self._render_hud()
+        rect = self.hud.get_rect(bottomleft=(0, surface.get_height()))
+        surface.blit(self.hud, rect)
+        return rect
+
+    def _render_hud(self):
+        # 기본 폰트는 한글이 없어서 HUD는 영문으로 씁니다.
+        if self.font is None:
+            self.font = pygame.font.Font(None, HUD_FONT_SIZE)
+        lines = self.summary_lines() or ["profiling..."]
+        surfaces = [self.font.render(line, True, HUD_COLOR) for line in lines]
+        line_height = self.font.get_linesize()
+        hud = pygame.Surface((max([HUD_WIDTH] + [s.get_width() + 8 for s in surfaces]), line_height * len(lines) + 6))
+        hud.fill(HUD_BACKGROUND)
+        for i, line in enumerate(surfaces):
+            hud.blit(line, (4, 3 + i * line_height))
+        return hud
+
+    def summary_lines(self):
+        """최근 프레임의 요약 문자열 목록. 아직 프레임이 없으면 빈 목록."""
+        if not self.recent:
+            return []
+        frame = sorted(r[0] for r in self.recent)
+        work = sorted(r[1] for r in self.recent)
+        count = len(self.recent)
+        means = [sum(r[2][i] for r in self.recent) / count for i in range(len(PHASES))]
+        lines = [
+            f"frame p50 {percentile(frame, 0.5):.2f} p99 {percentile(frame, 0.99):.2f} ms",
+            f"work  p50 {percentile(work, 0.5):.2f} p99 {percentile(work, 0.99):.2f} ms",
+            " ".join(f"{p} {m:.2f}" for p, m in zip(PHASES, means) if p != "wait" and m > 0),
+        ]
+        if self.track_allocations:
+            peaks = sorted(r[3] for r in self.recent)
+            lines.append(f"alloc peak p50 {percentile(peaks, 0.5):.1f} p99 {percentile(peaks, 0.99):.1f} KB/frame")
+        return lines
+
+    # --- 내보내기 ---
+    def close(self):
+        """요약을 출력하고 기록을 파일로 내보냅니다. 프로그램이 끝날 때 자동으로 불립니다."""
+        if not self.enabled or self.closed:
+            return
+        self.closed = True
+        if self.frame_start is not None:
+            self._end_frame(time.perf_counter())
+            self.frame_start = None
+        for line in self.summary_lines():
+            print(f"[{self.name}] {line}")
+        if self.export_path:
+            if self.export_path.lower().endswith(".json"):
+                self._write_trace(self.export_path)
+            else:
+                self._write_csv(self.export_path)
+            print(f"[{self.name}] 프레임 {len(self.records)}개를 {self.export_path}에 저장했습니다.")
+
+    def _write_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_ms", "total_ms"] + [f"{p}_ms" for p in PHASES] + ["alloc_net_bytes", "alloc_peak_bytes"])
+            for index, (start, total, phases, net, peak, _) in enumerate(self.records):
+                writer.writerow([index, f"{(start - self.origin) * 1000:.3f}", f"{total * 1000:.3f}"]
+                                + [f"{t * 1000:.3f}" for t in phases] + [net, peak])
+
+    def _write_trace(self, path):
+        """프레임과 단계를 'X'(구간) 이벤트로, 할당량을 'C'(카운터) 이벤트로 씁니다. 시간 단위는 마이크로초입니다."""
+        pid, origin = os.getpid(), self.origin
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.name}}]
+        for index, (start, total, _, net, peak, segments) in enumerate(self.records):
+            ts = (start - origin) * 1e6
+            events.append({"name": "frame", "ph": "X", "pid": pid, "tid": 0, "ts": ts, "dur": total * 1e6,
+                           "args": {"frame": index}})
+            for phase, begin, duration in segments:
+                events.append({"name": phase, "ph": "X", "pid": pid, "tid": 0,
+                               "ts": (begin - origin) * 1e6, "dur": duration * 1e6})
+            if self.track_allocations:
+                events.append({"name": "alloc", "ph": "C", "pid": pid, "tid": 0, "ts": ts,
+                               "args": {"net_bytes": net, "peak_bytes": peak}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def profiler_from_args(name, argv=None):
+    """GAME_PROFILE 환경 변수나 --profile [파일] 인자를 보고 프로파일러를 만듭니다. 둘 다 없으면 꺼진 프로파일러입니다."""
+    argv = sys.argv if argv is None else argv
+    setting = os.environ.get("GAME_PROFILE", "")
+    if "--profile" in argv:
+        index = argv.index("--profile")
+        has_path = len(argv) > index + 1 and not argv[index + 1].startswith("--")
+        setting = argv[index + 1] if has_path else "1"
+    enabled = setting not in ("", "0")
+    export_path = setting if enabled and setting != "1" else None
+    return FrameProfiler(name, enabled, export_path, os.environ.get("GAME_PROFILE_ALLOC", "1") != "0")
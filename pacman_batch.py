@@ -0,0 +1,167 @@
+import os
+import statistics
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1") # 작업 프로세스마다 인사말이 찍히지 않게 합니다.
+
+from pacman_core import FPS, DEFAULT_GHOSTS, DEFAULT_MAZE, NO_PELLET, WIN, GameState, Maze
+from pacman_level import load_level_pack
+
+# 시드를 정한 팩맨 게임 수천 판을 여러 프로세스에 나눠 돌리고 통계를 모읍니다. (밸런스 조정용)
+# 사용법: python pacman_batch.py [게임 수] [--workers N] [--ghosts N] [--seed S] [--max-seconds N] [--level 레벨팩 [번호]]
+
+DEFAULT_GAMES = 1000
+DEFAULT_MAX_SECONDS = 300 # 한 판의 최대 길이(게임 시간)
+HISTOGRAM_BINS = 10
+
+
+class GreedyPolicy:
+    """가장 가까운 펠렛으로 가되, 겁먹지 않은 고스트와 그 옆 칸은 피하는 단순한 플레이어 봇.
+
+    플레이어가 새 칸에 들어설 때만 BFS를 다시 합니다.
+    """
+    def __init__(self):
+        self.cell = None
+        self.action = None
+
+    def __call__(self, game):
+        maze = game.maze
+        start = maze.cell_at(game.player.pos)
+        if start == self.cell:
+            return self.action
+        self.cell = start
+
+        danger = set()
+        for ghost in game.ghosts:
+            if ghost.state != "FRIGHTENED":
+                cell = maze.cell_at(ghost.pos)
+                danger.add(cell)
+                danger.update(maze.neighbor_cell(cell, d) for d in maze.exits[cell])
+
+        # 첫 걸음 방향을 함께 들고 BFS를 해서, 가장 가까운 펠렛에 닿는 첫 방향을 고릅니다.
+        seen = {start}
+        queue = deque()
+        for d in maze.exits[start]:
+            n = maze.neighbor_cell(start, d)
+            if n not in danger:
+                seen.add(n)
+                queue.append((n, d))
+        while queue:
+            cell, first = queue.popleft()
+            if game.pellet_grid[cell] != NO_PELLET:
+                self.action = (first.x, first.y)
+                return self.action
+            for d in maze.exits[cell]:
+                n = maze.neighbor_cell(cell, d)
+                if n not in seen and n not in danger:
+                    seen.add(n)
+                    queue.append((n, first))
+
+        # 갈 곳이 없으면 아무 출구로나 도망칩니다.
+        exits = maze.exits[start]
+        if exits:
+            d = exits[game.rng.randrange(len(exits))]
+            self.action = (d.x, d.y)
+        return self.action
+
+
+@lru_cache(maxsize=None)
+def load_maze(level_path=None, level_number=1):
+    """작업 프로세스마다 레벨을 한 번만 불러옵니다. (컴파일 캐시가 있으면 바로 읽습니다)"""
+    if level_path is None:
+        return DEFAULT_MAZE
+    return Maze(load_level_pack(level_path)[level_number - 1])
+
+def run_game(seed, ghost_count=DEFAULT_GHOSTS, max_ticks=DEFAULT_MAX_SECONDS * FPS, level=(None, 1)):
+    """한 판을 끝까지 돌리고 (점수, 틱 수, 승리 여부)를 돌려줍니다. level은 (레벨팩 경로, 레벨 번호)입니다."""
+    game = GameState(seed, ghost_count, load_maze(*level))
+    policy = GreedyPolicy()
+    step = game.step
+    done = False
+    while not done and game.ticks < max_ticks:
+        _, done = step(policy(game))
+    return game.score, game.ticks, game.status == WIN
+
+def _run_chunk(args):
+    seeds, ghost_count, max_ticks, level = args
+    return [run_game(seed, ghost_count, max_ticks, level) for seed in seeds]
+
+
+def run_batch(games, workers=None, ghost_count=DEFAULT_GHOSTS, base_seed=0, max_ticks=DEFAULT_MAX_SECONDS * FPS,
+              level=(None, 1)):
+    """games판을 ProcessPoolExecutor로 나눠 돌리고 (결과 목록, 걸린 시간)을 돌려줍니다.
+
+    시드는 base_seed부터 차례로 쓰므로, 작업 프로세스 수와 상관없이 같은 결과가 나옵니다.
+    """
+    workers = workers or os.cpu_count() or 1
+    # 프로세스 간 통신 비용을 줄이려고 시드를 작업자 수의 몇 배 정도 묶음으로 나눕니다.
+    chunk = max(1, games // (workers * 8))
+    if level[0] is not None:
+        load_level_pack(level[0]) # 작업 프로세스들이 캐시를 나눠 쓰도록 먼저 한 번 컴파일해 둡니다.
+    chunks = [(range(start, min(start + chunk, base_seed + games)), ghost_count, max_ticks, level)
+              for start in range(base_seed, base_seed + games, chunk)]
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_run_chunk, chunks):
+            results.extend(part)
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    """결과 목록을 사람이 읽을 통계 문자열로 만듭니다."""
+    scores = sorted(score for score, _, _ in results)
+    ticks = [t for _, t, _ in results]
+    wins = sum(1 for _, _, won in results if won)
+    deciles = statistics.quantiles(scores, n=10) if len(scores) > 1 else scores * 9
+    lines = [
+        f"{len(results)}판, {elapsed:.1f}초 ({len(results) / elapsed:,.1f}판/초, {sum(ticks) / elapsed:,.0f}틱/초)",
+        f"점수: 평균 {statistics.fmean(scores):.1f}, 중앙값 {statistics.median(scores):.0f}, "
+        f"p10 {deciles[0]:.0f}, p90 {deciles[-1]:.0f}, 최고 {scores[-1]}",
+        f"생존 시간: 평균 {statistics.fmean(ticks) / FPS:.1f}초, 중앙값 {statistics.median(ticks) / FPS:.1f}초",
+        f"승리: {wins}판 ({wins / len(results):.1%})",
+        "점수 분포:",
+    ]
+    low, high = scores[0], scores[-1]
+    width = max(1, -(-(high - low + 1) // HISTOGRAM_BINS))
+    counts = [0] * HISTOGRAM_BINS
+    for score in scores:
+        counts[min((score - low) // width, HISTOGRAM_BINS - 1)] += 1
+    peak = max(counts)
+    for i, count in enumerate(counts):
+        bar = "#" * round(count / peak * 40) if peak else ""
+        lines.append(f"  {low + i * width:>6}~{low + (i + 1) * width - 1:<6} {count:>6} {bar}")
+    return "\n".join(lines)
+
+
+def main():
+    args = sys.argv[1:]
+    def option(name, default, kind=int):
+        return kind(args[args.index(name) + 1]) if name in args else default
+    games = int(args[0]) if args and args[0].isdigit() else DEFAULT_GAMES
+    level = (None, 1)
+    if "--level" in args:
+        index = args.index("--level")
+        number = args[index + 2] if len(args) > index + 2 and args[index + 2].isdigit() else 1
+        level = (args[index + 1], int(number))
+        count = len(load_level_pack(level[0]))
+        if not 1 <= level[1] <= count:
+            print(f"레벨 번호는 1~{count} 사이여야 합니다.")
+            sys.exit(1)
+    results, elapsed = run_batch(
+        games,
+        workers=option("--workers", None),
+        ghost_count=option("--ghosts", DEFAULT_GHOSTS),
+        base_seed=option("--seed", 0),
+        max_ticks=int(option("--max-seconds", DEFAULT_MAX_SECONDS, float) * FPS),
+        level=level,
+    )
+    print(summarize(results, elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+import random
+from array import array
+from collections import deque
+from operator import attrgetter
+
+import pygame
+
+from pacman_level import DIRECTION_OFFSETS, NO_PELLET, PELLET, POWER_PELLET, compile_level
+
+# 화면 없이 동작하는 팩맨 규칙입니다. 그리기와 입력은 '팩맨 2.0.py'가 담당합니다.
+# 위치 계산에는 pygame.Vector2/Rect만 쓰므로 창을 열지 않고도 여러 판을 돌릴 수 있습니다.
+
+# --- 상수 ---
+# 속도와 시간은 게임 시간(초) 기준입니다. 규칙은 1/FPS초 길이의 고정 틱으로 잘게 나눠 진행하므로,
+# 화면 프레임이 밀리거나 빨리 감아도 한 틱에 움직이는 거리는 같고 칸 중심을 건너뛰지 않습니다.
+FPS = 60 # 게임 시간 1초당 틱 수 (화면 프레임 수와는 별개)
+MAZE_TOP_OFFSET = 50
+GRID_SIZE = 30
+PLAYER_SPEED = 150 # 픽셀/초
+GHOST_SPEED = 120 # 픽셀/초
+GHOST_FRIGHTENED_SPEED = 90 # 픽셀/초
+FRIGHTENED_TIME = 7 # 초
+SCATTER_TIME = 7 # 고스트가 각자 구석으로 흩어지는 시간(초)
+CHASE_TIME = 20 # 고스트가 플레이어를 쫓는 시간(초)
+DEFAULT_GHOSTS = None # None이면 고스트 시작 칸(G)마다 한 마리
+FAR_GHOST_DISTANCE = 24 * GRID_SIZE # 플레이어와 가로나 세로로 이만큼(픽셀) 넘게 떨어진 고스트는
+FAR_GHOST_TICKS = 4 # 이 틱마다 한 번, 그만큼 큰 걸음으로 움직입니다. (한 걸음이 칸 반보다 작아야 합니다)
+
+def seconds_to_ticks(seconds):
+    return round(seconds * FPS)
+
+FRIGHTENED_DURATION = seconds_to_ticks(FRIGHTENED_TIME)
+SCATTER_DURATION = seconds_to_ticks(SCATTER_TIME)
+CHASE_DURATION = seconds_to_ticks(CHASE_TIME)
+
+# --- 점수 ---
+SCORE_PELLET = 10
+SCORE_POWER_PELLET = 50
+SCORE_GHOST = 200
+
+# --- 게임 상태 ---
+PLAYING = "PLAYING"
+GAME_OVER = "GAME_OVER"
+WIN = "WIN"
+
+# --- 미로 데이터 ---
+ORIGINAL_MAZE = [
+    "WWWWWWWWWWWWWWWWWWWW",
+    "WP........W........PW",
+    "W.WW.WWW.WW.WWW.WW.W",
+    "W.WW.WWW.WW.WWW.WW.W",
+    "W..................W",
+    "W.WW.W.WWWWWW.W.WW.W",
+    "W....W...WW...W....W",
+    "WWWW.WWWW..WWWW.WWWW",
+    "   W.W G G  W.W   ",
+    "WWWW.W.WWWWWW.W.WWWW",
+    "W......W....W......W",
+    "W.WWWW.W.WW.W.WWWW.W",
+    "WP.................PW",
+    "WWWWWWWWWWWWWWWWWWWW",
+]
+
+# 펠렛은 칸별 바이트 격자(pellet_grid)에 종류(NO_PELLET, PELLET, POWER_PELLET)만 저장합니다.
+# 먹기 판정은 플레이어가 있는 칸 하나만 봅니다.
+
+# --- 이동 표 ---
+# 미로는 한 번만 분석합니다. 이동 판단은 칸 번호(y * 가로 + x)로 표를 찾아보는 것으로 끝납니다.
+DIRECTIONS = tuple(pygame.Vector2(dx, dy) for dx, dy in DIRECTION_OFFSETS)
+UNREACHED = 1 << 30
+# 출구 비트마스크(0~15)마다 나갈 수 있는 방향 튜플을 미리 만들어 둡니다.
+EXIT_DIRECTIONS = [tuple(d for bit, d in enumerate(DIRECTIONS) if mask >> bit & 1) for mask in range(16)]
+
+def get_grid_pos(pos):
+    return int(pos.x / GRID_SIZE), int((pos.y - MAZE_TOP_OFFSET) / GRID_SIZE)
+
+def tile_center(pos):
+    """pos가 있는 칸의 중심 픽셀 좌표"""
+    return pygame.Vector2(
+        (int(pos.x / GRID_SIZE) * GRID_SIZE) + GRID_SIZE / 2,
+        (int((pos.y - MAZE_TOP_OFFSET) / GRID_SIZE) * GRID_SIZE) + GRID_SIZE / 2 + MAZE_TOP_OFFSET)
+
+def is_on_tile_center(pos, step):
+    """이번 틱에 칸 중심을 지나는지 (이동 방향을 정할 수 있는지). step은 한 틱에 움직이는 픽셀 수입니다."""
+    return (abs(pos.x % GRID_SIZE - (GRID_SIZE / 2)) < step
+            and abs((pos.y - MAZE_TOP_OFFSET) % GRID_SIZE - (GRID_SIZE / 2)) < step)
+
+
+class SparseField(dict):
+    """반경을 정해 구한 거리장. 구하지 않은 칸은 UNREACHED입니다."""
+    def __missing__(self, cell):
+        return UNREACHED
+
+
+def cell_center(cell, width):
+    """칸 번호의 중심 픽셀 좌표"""
+    return (cell % width) * GRID_SIZE + GRID_SIZE / 2, (cell // width) * GRID_SIZE + MAZE_TOP_OFFSET + GRID_SIZE / 2
+
+
+class Maze:
+    """컴파일된 레벨(pacman_level.CompiledLevel)의 이동 표. 바뀌지 않으므로 같은 레벨의 모든 게임이 하나를 함께 씁니다.
+
+    플레이어는 exits를, 고스트는 고스트 문도 지나가는 ghost_exits를 따라 움직입니다.
+    field_radius를 주면 거리장을 그 거리(칸)까지만 구합니다. 큰 미로에서 그보다 먼 고스트는 목표 없이 돌아다닙니다.
+    """
+    def __init__(self, level, field_radius=None):
+        self.level = level
+        self.field_radius = field_radius
+        self.width = level.width
+        self.height = level.height
+        self.exits = [EXIT_DIRECTIONS[mask] for mask in level.exits]
+        self.ghost_exits = [EXIT_DIRECTIONS[mask] for mask in level.ghost_exits]
+        # 흩어지기(scatter) 목표는 파워 펠렛 칸들입니다. 거리장도 한 번만 구합니다.
+        self.scatter_fields = [self.distance_field(cell) for cell in level.power_cells]
+
+    def cell_at(self, pos):
+        x, y = get_grid_pos(pos)
+        return y * self.width + x
+
+    def exits_at(self, pos):
+        """pos가 있는 칸에서 나갈 수 있는 방향들"""
+        return self.exits[self.cell_at(pos)]
+
+    def neighbor_cell(self, cell, direction):
+        return cell + int(direction.y) * self.width + int(direction.x)
+
+    def distance_field(self, start):
+        """start 칸에서 모든 칸까지 고스트가 가는 길로 잰 거리(BFS)를 칸 번호 순으로 돌려줍니다. 닿지 않는 칸은 UNREACHED."""
+        if self.field_radius is not None:
+            return self.bounded_distance_field(start, self.field_radius)
+        dist = array('i', [UNREACHED]) * len(self.exits)
+        dist[start] = 0
+        queue = deque([start])
+        exits, neighbor_cell = self.ghost_exits, self.neighbor_cell
+        while queue:
+            cell = queue.popleft()
+            next_dist = dist[cell] + 1
+            for d in exits[cell]:
+                n = neighbor_cell(cell, d)
+                if next_dist < dist[n]:
+                    dist[n] = next_dist
+                    queue.append(n)
+        return dist
+
+    def bounded_distance_field(self, start, radius):
+        """distance_field와 같지만 radius 칸까지만 구해 SparseField로 돌려줍니다. 비용이 미로 크기와 무관합니다."""
+        dist = SparseField({start: 0})
+        queue = deque([start])
+        exits, neighbor_cell = self.ghost_exits, self.neighbor_cell
+        while queue:
+            cell = queue.popleft()
+            next_dist = dist[cell] + 1
+            if next_dist > radius:
+                continue
+            for d in exits[cell]:
+                n = neighbor_cell(cell, d)
+                if n not in dist:
+                    dist[n] = next_dist
+                    queue.append(n)
+        return dist
+
+DEFAULT_MAZE = Maze(compile_level(ORIGINAL_MAZE, "클래식"))
+
+
+# --- 플레이어 클래스 ---
+class Player:
+    def __init__(self, x, y):
+        self.start_pos = pygame.Vector2(x, y)
+        self.pos = pygame.Vector2(x, y)
+        self.radius = GRID_SIZE // 2 - 2
+        self.speed = PLAYER_SPEED
+        self.direction = pygame.Vector2(0, 0)
+        self.next_direction = pygame.Vector2(0, 0)
+        self.rect = pygame.Rect(self.pos.x - self.radius, self.pos.y - self.radius, self.radius * 2, self.radius*2)
+
+    def reset(self):
+        self.pos = pygame.Vector2(self.start_pos.x, self.start_pos.y)
+        self.direction = pygame.Vector2(0, 0)
+        self.next_direction = pygame.Vector2(0, 0)
+        self.rect.center = self.pos
+
+    def move(self, maze):
+        step = self.speed / FPS
+        if is_on_tile_center(self.pos, step):
+            center = tile_center(self.pos)
+            exits = maze.exits_at(center)
+            if self.next_direction != (0,0) and self.next_direction in exits:
+                self.pos = center
+                self.direction = self.next_direction
+                self.next_direction = pygame.Vector2(0,0)
+            elif self.direction != (0,0) and self.direction not in exits:
+                self.pos = center
+                self.direction = pygame.Vector2(0,0) # Stop
+
+        if self.direction != (0,0):
+             self.pos += self.direction * step
+        self.rect.center = self.pos
+
+# --- 고스트 클래스 ---
+class Ghost:
+    def __init__(self, x, y, index=0, home=0):
+        self.start_pos = pygame.Vector2(x, y)
+        self.pos = pygame.Vector2(x, y)
+        self.radius = GRID_SIZE // 2 - 2
+        self.index = index # 색 등 겉모습을 고를 때 쓰는 번호
+        self.home = home # 흩어질 때 갈 scatter_fields 번호
+        self.direction = DIRECTIONS[0]
+        self.rect = pygame.Rect(self.pos.x - self.radius, self.pos.y - self.radius, self.radius * 2, self.radius*2)
+        self.state = "CHASE" # CHASE, SCATTER, FRIGHTENED
+        self.speed = GHOST_SPEED
+        self.cell = None # GhostGrid가 관리하는 현재 칸
+
+    def reset(self, state, rng):
+        self.pos = pygame.Vector2(self.start_pos.x, self.start_pos.y)
+        self.direction = rng.choice(DIRECTIONS)
+        self.state = state
+        self.speed = GHOST_SPEED
+        self.rect.center = self.pos
+
+    def move(self, game, ticks=1):
+        """ticks 틱만큼 움직입니다. 멀리 있는 고스트는 여러 틱을 한 걸음에 몰아서 움직입니다."""
+        if self.state == "FRIGHTENED": self.speed = GHOST_FRIGHTENED_SPEED
+        else: self.speed = GHOST_SPEED
+        step = self.speed / FPS * ticks
+
+        if is_on_tile_center(self.pos, step):
+            maze, rng = game.maze, game.rng
+            center = tile_center(self.pos)
+            cell = maze.cell_at(center)
+            exits = maze.ghost_exits[cell]
+            possible_directions = list(exits)
+            if len(possible_directions) > 1 and self.direction * -1 in possible_directions:
+                possible_directions.remove(self.direction * -1)
+
+            if self.state == "FRIGHTENED":
+                # 겁먹은 고스트는 무작위로 돌아다닙니다.
+                if self.direction not in exits or (len(possible_directions) > 1 and rng.random() < 0.2):
+                    self.pos = center
+                    if possible_directions: self.direction = rng.choice(possible_directions)
+            elif possible_directions:
+                # 공유 거리장에서 목표에 가장 가까워지는 출구를 고릅니다. 고스트 수와 상관없이 칸마다 표 몇 번만 봅니다.
+                if self.state == "CHASE" or not maze.scatter_fields:
+                    field = game.player_field
+                else:
+                    field = maze.scatter_fields[self.home]
+                rng.shuffle(possible_directions) # 거리가 같으면 무작위로 골라 고스트끼리 겹치지 않게 합니다.
+                self.pos = center
+                self.direction = min(possible_directions, key=lambda d: field[maze.neighbor_cell(cell, d)])
+
+        self.pos += self.direction * step
+        self.rect.center = self.pos
+        cell = game.maze.cell_at(self.pos)
+        if cell != self.cell:
+            game.ghost_grid.move(self, cell)
+
+
+class GhostGrid:
+    """고스트를 칸 단위 균일 격자(공간 해시)에 나눠 담습니다. 칸 번호 -> 그 칸의 고스트 집합.
+
+    플레이어와의 충돌은 주변 3x3 칸만, 화면 그리기는 보이는 칸만 찾아보면 됩니다.
+    """
+    def __init__(self, width):
+        self.width = width
+        self.buckets = {}
+
+    def add(self, ghost, cell):
+        ghost.cell = cell
+        bucket = self.buckets.get(cell)
+        if bucket is None:
+            bucket = self.buckets[cell] = set()
+        bucket.add(ghost)
+
+    def move(self, ghost, cell):
+        bucket = self.buckets[ghost.cell]
+        bucket.discard(ghost)
+        if not bucket:
+            del self.buckets[ghost.cell]
+        self.add(ghost, cell)
+
+    def near(self, cell):
+        """cell과 그 주변 8칸에 있는 고스트를 번호 순으로 돌려줍니다. (칸보다 작은 물체끼리의 충돌 후보)"""
+        buckets, width = self.buckets, self.width
+        found = []
+        for row in (cell - width, cell, cell + width):
+            for n in (row - 1, row, row + 1):
+                bucket = buckets.get(n)
+                if bucket:
+                    found.extend(bucket)
+        found.sort(key=attrgetter("index"))
+        return found
+
+    def in_area(self, left, top, right, bottom):
+        """칸 좌표 [left, right] x [top, bottom] 안의 고스트들"""
+        buckets, width = self.buckets, self.width
+        left, right = max(left, 0), min(right, width - 1)
+        for y in range(max(top, 0), bottom + 1):
+            row = y * width
+            for cell in range(row + left, row + right + 1):
+                bucket = buckets.get(cell)
+                if bucket:
+                    yield from bucket
+
+
+class GameState:
+    """팩맨 한 판의 전체 상태. 창 없이 step()으로 한 틱씩 진행합니다.
+
+    같은 seed와 같은 입력이면 항상 같은 결과가 나옵니다.
+    """
+    def __init__(self, seed=None, ghost_count=DEFAULT_GHOSTS, maze=DEFAULT_MAZE):
+        self.maze = maze
+        self.rng = random.Random(seed)
+        self.ghost_count = len(maze.level.ghost_starts) if ghost_count is None else ghost_count
+        self.pellet_grid = bytearray(maze.width * maze.height)
+        self.player = Player(*cell_center(maze.level.player_start, maze.width))
+        self.ghosts = []
+        self.reset()
+
+    def reset(self, seed=None):
+        """새 게임을 시작합니다. seed를 주면 난수 생성기를 다시 시드합니다."""
+        if seed is not None:
+            self.rng.seed(seed)
+        maze = self.maze
+        self.status = PLAYING
+        self.score = 0
+        self.ticks = 0
+        self.tick_debt = 0.0 # advance()가 아직 틱으로 바꾸지 못한 게임 시간(틱 단위)
+        self.frightened_timer = 0
+        self.ghost_mode = "SCATTER" # 겁먹지 않은 고스트의 현재 상태 (SCATTER, CHASE)
+        self.ghost_mode_timer = SCATTER_DURATION
+        self.eaten = [] # 먹힌 펠렛 (칸, 종류). step()은 틱마다 비우고, advance()는 부른 쪽이 비울 때까지 쌓습니다.
+        # 컴파일된 레벨의 펠렛 배치를 그대로 복사합니다. 미로 문자열은 다시 읽지 않습니다.
+        level = maze.level
+        self.pellet_grid[:] = level.pellets
+        self.pellets_left = level.pellet_count
+        self.player.reset()
+
+        # 고스트가 시작 칸보다 많으면 시작 칸을 돌아가며 나눠 씁니다.
+        starts = level.ghost_starts
+        homes = max(len(maze.scatter_fields), 1)
+        self.ghosts = [Ghost(*cell_center(starts[i % len(starts)], maze.width), i, i % homes)
+                       for i in range(self.ghost_count)]
+        self.ghost_grid = GhostGrid(maze.width)
+        for ghost in self.ghosts:
+            ghost.reset(self.ghost_mode, self.rng)
+            self.ghost_grid.add(ghost, maze.cell_at(ghost.pos))
+
+        # 추격 목표는 플레이어 칸에서 시작한 거리장 하나를 모든 고스트가 함께 씁니다.
+        self.player_field_cell = None
+        self.player_field = None
+        self.update_player_field()
+
+    def update_player_field(self):
+        """플레이어가 새 칸에 들어섰을 때만 거리장을 다시 구합니다."""
+        cell = self.maze.cell_at(self.player.pos)
+        if cell != self.player_field_cell:
+            self.player_field_cell = cell
+            self.player_field = self.maze.distance_field(cell)
+
+    @property
+    def done(self):
+        return self.status != PLAYING
+
+    def step(self, action=None):
+        """한 틱을 진행합니다. action은 원하는 방향 (dx, dy) 또는 None(입력 없음)입니다.
+
+        (이번 틱에 얻은 점수, 끝났는지)를 돌려줍니다. eaten에는 이번 틱에 먹힌 펠렛만 남습니다.
+        """
+        self.eaten.clear()
+        return self._tick(action)
+
+    def _tick(self, action):
+        if self.status != PLAYING:
+            return 0, True
+        self.ticks += 1
+        gained = 0
+
+        if self.frightened_timer > 0:
+            self.frightened_timer -= 1
+            if self.frightened_timer == 0:
+                for ghost in self.ghosts: ghost.state = self.ghost_mode
+        else:
+            # 흩어지기와 추격을 번갈아 합니다. 겁먹은 동안에는 시간이 멈춥니다.
+            self.ghost_mode_timer -= 1
+            if self.ghost_mode_timer == 0:
+                self.ghost_mode = "CHASE" if self.ghost_mode == "SCATTER" else "SCATTER"
+                self.ghost_mode_timer = CHASE_DURATION if self.ghost_mode == "CHASE" else SCATTER_DURATION
+                for ghost in self.ghosts: ghost.state = self.ghost_mode
+
+        player = self.player
+        if action is not None:
+            player.next_direction = pygame.Vector2(action)
+        player.move(self.maze)
+        self.update_player_field()
+        # 플레이어에게서 먼 고스트는 FAR_GHOST_TICKS 틱마다 한 번만 움직입니다. 번호로 차례를 나눠 틱마다 부담을 고르게 합니다.
+        px, py = player.pos
+        ticks = self.ticks
+        for ghost in self.ghosts:
+            if abs(ghost.pos.x - px) > FAR_GHOST_DISTANCE or abs(ghost.pos.y - py) > FAR_GHOST_DISTANCE:
+                if (ticks + ghost.index) % FAR_GHOST_TICKS == 0:
+                    ghost.move(self, FAR_GHOST_TICKS)
+            else:
+                ghost.move(self)
+
+        cell = self.maze.cell_at(player.pos)
+        if 0 <= cell < len(self.pellet_grid) and self.pellet_grid[cell]:
+            kind = self.pellet_grid[cell]
+            self.pellet_grid[cell] = NO_PELLET
+            self.pellets_left -= 1
+            self.eaten.append((cell, kind))
+            if kind == POWER_PELLET:
+                gained += SCORE_POWER_PELLET
+                self.frightened_timer = FRIGHTENED_DURATION
+                for ghost in self.ghosts: ghost.state = "FRIGHTENED"
+            else: gained += SCORE_PELLET
+
+        # 고스트는 칸보다 작으므로 플레이어 칸 주변 3x3 칸의 고스트만 확인하면 됩니다.
+        for ghost in self.ghost_grid.near(cell):
+            if player.rect.colliderect(ghost.rect):
+                if ghost.state == "FRIGHTENED":
+                    gained += SCORE_GHOST
+                    ghost.reset(self.ghost_mode, self.rng)
+                    self.ghost_grid.move(ghost, self.maze.cell_at(ghost.pos))
+                else:
+                    self.status = GAME_OVER
+                    break
+
+        if self.status == PLAYING and self.pellets_left == 0: self.status = WIN
+        self.score += gained
+        return gained, self.status != PLAYING
+
+    def advance(self, seconds, action=None, max_ticks=None):
+        """게임 시간을 seconds초만큼 진행합니다. 1/FPS초 틱으로 나눠 step()을 부르고, 남는 시간은 다음 호출로 넘깁니다.
+
+        max_ticks를 주면 한 번에 그 이상은 진행하지 않고 밀린 시간을 버립니다. (이번에 얻은 점수, 끝났는지)를 돌려줍니다.
+        여러 틱 동안 먹힌 펠렛이 eaten에 쌓이므로, 부른 쪽이 처리한 뒤 비워야 합니다.
+        """
+        self.tick_debt += seconds * FPS
+        ticks = int(self.tick_debt)
+        if max_ticks is not None and ticks > max_ticks:
+            ticks = max_ticks
+            self.tick_debt = float(ticks)
+        self.tick_debt -= ticks
+        gained = 0
+        tick = self._tick
+        for _ in range(ticks):
+            points, done = tick(action)
+            gained += points
+            if done:
+                self.tick_debt = 0.0
+                break
+        return gained, self.status != PLAYING
@@ -0,0 +1,306 @@
+import hashlib
+import os
+import random
+import struct
+from array import array
+from collections import deque
+
+# 팩맨 레벨 파일을 검증된 컴파일 형태로 바꾸고, 그 결과를 내용 해시로 디스크에 캐시합니다.
+#
+# 레벨 팩 파일(텍스트): ';'로 시작하는 줄이 새 레벨의 이름이고, 그 아래 줄들이 미로입니다. 빈 줄은 무시합니다.
+#   W 벽, . 펠렛, P 파워 펠렛, G 고스트 시작 칸, S 플레이어 시작 칸, - 고스트 문(플레이어만 막힘), 공백 빈 길
+#   줄 길이가 다르면 짧은 줄을 벽으로 채웁니다. S가 없으면 읽는 순서로 첫 번째 길 칸에서 시작합니다.
+#
+# 컴파일 결과: 벽 비트맵, 칸별 펠렛 종류, 시작 칸들, 칸별 출구 비트마스크(플레이어용/고스트용)
+
+# --- 칸 종류 ---
+OPEN = 0
+WALL = 1
+GATE = 2
+
+# --- 펠렛 종류 (pacman_core와 같은 값) ---
+NO_PELLET = 0
+PELLET = 1
+POWER_PELLET = 2
+
+# 출구 비트 i는 DIRECTION_OFFSETS[i] 방향입니다.
+DIRECTION_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+TILE_CHARS = {'W': WALL, '-': GATE}
+PELLET_CHARS = {'.': PELLET, 'P': POWER_PELLET}
+VALID_CHARS = set("W.PGS- ")
+
+# --- 미로 생성 ---
+GENERATED_BRAID = 1.0 # 막다른 길을 뚫어 고리로 만드는 비율 (1이면 막다른 길이 없습니다)
+GENERATED_LOOPS = 0.05 # 그 밖에 무작위로 더 허무는 벽의 비율
+GENERATED_POWER_SPACING = 50 # 파워 펠렛 사이 간격(칸)
+GENERATED_GHOST_SPACING = 12 # 고스트 시작 칸 사이 간격(칸)
+GENERATED_SAFE_RADIUS = 10 # 플레이어 시작 칸 근처에는 고스트 시작 칸을 두지 않습니다.
+
+# --- 캐시 형식 ---
+CACHE_DIR_NAME = ".pacman_cache"
+MAGIC = b"PMLV"
+VERSION = 1
+PACK_HEADER = struct.Struct("<4sBI") # 매직, 버전, 레벨 수
+LEVEL_HEADER = struct.Struct("<HHHIHH") # 이름 길이, 가로, 세로, 플레이어 시작 칸, 고스트 시작 칸 수, 파워 펠렛 수
+
+
+class LevelError(ValueError):
+    """레벨 내용이 잘못되었을 때"""
+
+
+class CompiledLevel:
+    """검증을 마친 레벨. 모든 칸 정보는 칸 번호(y * width + x) 순서의 bytes입니다."""
+    def __init__(self, name, width, height, tiles, pellets, exits, ghost_exits, player_start, ghost_starts, power_cells):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.tiles = tiles # OPEN, WALL, GATE
+        self.pellets = pellets # NO_PELLET, PELLET, POWER_PELLET
+        self.exits = exits # 플레이어 출구 비트마스크 (고스트 문은 막힘)
+        self.ghost_exits = ghost_exits # 고스트 출구 비트마스크 (고스트 문도 지나감)
+        self.player_start = player_start
+        self.ghost_starts = ghost_starts
+        self.power_cells = power_cells
+        self.pellet_count = len(pellets) - pellets.count(NO_PELLET)
+
+
+# --- 컴파일 ---
+def _exit_masks(width, height, passable):
+    masks = bytearray(width * height)
+    for cell in range(width * height):
+        if not passable[cell]:
+            continue
+        x, y = cell % width, cell // width
+        mask = 0
+        for bit, (dx, dy) in enumerate(DIRECTION_OFFSETS):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and passable[ny * width + nx]:
+                mask |= 1 << bit
+        masks[cell] = mask
+    return bytes(masks)
+
+def _reachable(width, start, masks):
+    seen = bytearray(len(masks))
+    seen[start] = 1
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        mask = masks[cell]
+        for bit, (dx, dy) in enumerate(DIRECTION_OFFSETS):
+            if mask >> bit & 1:
+                n = cell + dy * width + dx
+                if not seen[n]:
+                    seen[n] = 1
+                    queue.append(n)
+    return seen
+
+def compile_level(rows, name="level"):
+    """미로 줄 목록을 검증하고 CompiledLevel로 만듭니다. 문제가 있으면 LevelError."""
+    rows = [row.rstrip("\n") for row in rows]
+    if not rows:
+        raise LevelError(f"{name}: 미로가 비어 있습니다.")
+    for y, row in enumerate(rows):
+        bad = set(row) - VALID_CHARS
+        if bad:
+            raise LevelError(f"{name}: {y + 1}번째 줄에 알 수 없는 글자 {''.join(sorted(bad))!r}")
+    width, height = max(len(row) for row in rows), len(rows)
+    if width > 0xFFFF or height > 0xFFFF:
+        raise LevelError(f"{name}: 미로가 너무 큽니다.")
+    rows = [row.ljust(width, 'W') for row in rows]
+
+    tiles = bytearray(width * height)
+    pellets = bytearray(width * height)
+    player_start = None
+    ghost_starts, power_cells = [], []
+    for y, row in enumerate(rows):
+        for x, char in enumerate(row):
+            cell = y * width + x
+            tiles[cell] = TILE_CHARS.get(char, OPEN)
+            pellets[cell] = PELLET_CHARS.get(char, NO_PELLET)
+            if char == 'P':
+                power_cells.append(cell)
+            elif char == 'G':
+                ghost_starts.append(cell)
+            elif char == 'S':
+                if player_start is not None:
+                    raise LevelError(f"{name}: 플레이어 시작 칸(S)이 둘 이상입니다.")
+                player_start = cell
+    if player_start is None:
+        player_start = next((cell for cell, tile in enumerate(tiles) if tile == OPEN), None)
+        if player_start is None:
+            raise LevelError(f"{name}: 걸을 수 있는 칸이 없습니다.")
+    if not ghost_starts:
+        raise LevelError(f"{name}: 고스트 시작 칸(G)이 없습니다.")
+    if not any(pellets):
+        raise LevelError(f"{name}: 펠렛이 없습니다.")
+
+    exits = _exit_masks(width, height, [tile == OPEN for tile in tiles])
+    ghost_exits = _exit_masks(width, height, [tile != WALL for tile in tiles])
+    # 플레이어가 못 가는 펠렛이 있으면 깰 수 없는 레벨입니다.
+    reachable = _reachable(width, player_start, exits)
+    stranded = sum(1 for cell, kind in enumerate(pellets) if kind and not reachable[cell])
+    if stranded:
+        raise LevelError(f"{name}: 플레이어가 닿을 수 없는 펠렛이 {stranded}개 있습니다.")
+    ghost_reachable = _reachable(width, player_start, ghost_exits)
+    if any(not ghost_reachable[cell] for cell in ghost_starts):
+        raise LevelError(f"{name}: 플레이어에게 갈 수 없는 고스트 시작 칸이 있습니다.")
+
+    return CompiledLevel(name, width, height, bytes(tiles), bytes(pellets), exits, ghost_exits,
+                         player_start, tuple(ghost_starts), tuple(power_cells))
+
+
+def generate_rows(width, height, seed=None):
+    """width x height 칸짜리 미로를 무작위로 만들어 레벨 줄 목록으로 돌려줍니다.
+
+    깊이 우선 탐색으로 길을 판 뒤 막다른 길을 없애 고리가 많은 팩맨식 미로로 만듭니다. 크기는 홀수로 맞춥니다.
+    """
+    width, height = max(5, width | 1), max(5, height | 1)
+    rng = random.Random(seed)
+    grid = [bytearray(b'W' * width) for _ in range(height)]
+    # 홀수 좌표 칸이 방이고, 방 사이의 벽을 허물어 길을 냅니다.
+    steps = ((2, 0), (-2, 0), (0, 2), (0, -2))
+    grid[1][1] = ord('.')
+    stack = [(1, 1)]
+    while stack:
+        x, y = stack[-1]
+        options = [(dx, dy) for dx, dy in steps
+                   if 0 < x + dx < width - 1 and 0 < y + dy < height - 1 and grid[y + dy][x + dx] == ord('W')]
+        if not options:
+            stack.pop()
+            continue
+        dx, dy = rng.choice(options)
+        grid[y + dy // 2][x + dx // 2] = grid[y + dy][x + dx] = ord('.')
+        stack.append((x + dx, y + dy))
+
+    def open_neighbors(x, y):
+        return [(dx, dy) for dx, dy in DIRECTION_OFFSETS if grid[y + dy][x + dx] != ord('W')]
+
+    for y in range(1, height - 1, 2):
+        for x in range(1, width - 1, 2):
+            if len(open_neighbors(x, y)) == 1 and rng.random() < GENERATED_BRAID:
+                walls = [(dx, dy) for dx, dy in DIRECTION_OFFSETS
+                         if 0 < x + 2 * dx < width - 1 and 0 < y + 2 * dy < height - 1 and grid[y + dy][x + dx] == ord('W')]
+                if walls:
+                    dx, dy = rng.choice(walls)
+                    grid[y + dy][x + dx] = ord('.')
+    for y in range(1, height - 1):
+        for x in range(1 + y % 2, width - 1, 2):
+            # 방 사이의 벽(좌표 하나만 홀수)만 허뭅니다.
+            if grid[y][x] == ord('W') and rng.random() < GENERATED_LOOPS:
+                grid[y][x] = ord('.')
+
+    def nearest_open(x, y):
+        x, y = min(max(x | 1, 1), width - 2), min(max(y | 1, 1), height - 2)
+        return x, y # 홀수 좌표 방은 언제나 길입니다.
+
+    start_x, start_y = nearest_open(width // 2, height // 2)
+    for y in range(GENERATED_POWER_SPACING // 2, height, GENERATED_POWER_SPACING):
+        for x in range(GENERATED_POWER_SPACING // 2, width, GENERATED_POWER_SPACING):
+            px, py = nearest_open(x, y)
+            grid[py][px] = ord('P')
+    for y in range(GENERATED_GHOST_SPACING // 2, height, GENERATED_GHOST_SPACING):
+        for x in range(GENERATED_GHOST_SPACING // 2, width, GENERATED_GHOST_SPACING):
+            gx, gy = nearest_open(x, y)
+            if max(abs(gx - start_x), abs(gy - start_y)) > GENERATED_SAFE_RADIUS and grid[gy][gx] == ord('.'):
+                grid[gy][gx] = ord('G')
+    if not any(ord('G') in row for row in grid):
+        grid[1][1] = ord('G') # 작은 미로에서는 구석 방 하나를 고스트 시작 칸으로 씁니다.
+    grid[start_y][start_x] = ord('S')
+    return [row.decode("ascii") for row in grid]
+
+def generate_level(width, height, seed=None):
+    """무작위 미로를 만들어 컴파일합니다."""
+    return compile_level(generate_rows(width, height, seed), f"생성 {width}x{height} #{seed}")
+
+
+def parse_pack(text, default_name="level"):
+    """레벨 팩 텍스트를 (이름, 줄 목록) 목록으로 나눕니다."""
+    levels = []
+    name, rows = default_name, []
+    for line in text.splitlines():
+        if line.startswith(';'):
+            if rows:
+                levels.append((name, rows))
+            name, rows = line[1:].strip() or default_name, []
+        elif line.strip():
+            rows.append(line)
+    if rows:
+        levels.append((name, rows))
+    if not levels:
+        raise LevelError(f"{default_name}: 레벨이 없습니다.")
+    return levels
+
+
+# --- 직렬화 ---
+def _pack_bytes(levels):
+    out = bytearray(PACK_HEADER.pack(MAGIC, VERSION, len(levels)))
+    for level in levels:
+        name = level.name.encode("utf-8")
+        out += LEVEL_HEADER.pack(len(name), level.width, level.height, level.player_start,
+                                 len(level.ghost_starts), len(level.power_cells))
+        out += name
+        out += array('I', level.ghost_starts).tobytes()
+        out += array('I', level.power_cells).tobytes()
+        out += level.tiles + level.pellets + level.exits + level.ghost_exits
+    return bytes(out)
+
+def _take(data, offset, length):
+    """data[offset:offset + length]. 파일이 잘려서 모자라면 LevelError를 냅니다."""
+    if offset + length > len(data):
+        raise LevelError("레벨 캐시가 잘렸습니다.")
+    return data[offset:offset + length]
+
+def _unpack_bytes(data):
+    magic, version, count = PACK_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise LevelError("레벨 캐시 형식이 다릅니다.")
+    offset = PACK_HEADER.size
+    levels = []
+    for _ in range(count):
+        name_len, width, height, player_start, ghosts, powers = LEVEL_HEADER.unpack_from(data, offset)
+        offset += LEVEL_HEADER.size
+        name = _take(data, offset, name_len).decode("utf-8")
+        offset += name_len
+        cells = array('I')
+        cells.frombytes(_take(data, offset, (ghosts + powers) * cells.itemsize))
+        offset += (ghosts + powers) * cells.itemsize
+        size = width * height
+        tiles, pellets, exits, ghost_exits = (_take(data, offset + i * size, size) for i in range(4))
+        offset += 4 * size
+        levels.append(CompiledLevel(name, width, height, tiles, pellets, exits, ghost_exits, player_start,
+                                    tuple(cells[:ghosts]), tuple(cells[ghosts:])))
+    if offset != len(data):
+        raise LevelError("레벨 캐시 뒤에 남는 바이트가 있습니다.")
+    return levels
+
+
+# --- 불러오기 ---
+def load_level_pack(path, cache_dir=None):
+    """레벨 팩 파일을 불러옵니다. 같은 내용을 컴파일한 캐시가 있으면 파싱과 검증을 건너뜁니다.
+
+    캐시는 기본적으로 팩 파일 옆의 .pacman_cache/<내용 해시>.bin 입니다.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(MAGIC + bytes([VERSION]) + raw).hexdigest()[:32]
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    cache_path = os.path.join(cache_dir, digest + ".bin")
+    try:
+        with open(cache_path, "rb") as f:
+            return _unpack_bytes(f.read())
+    except (OSError, LevelError, struct.error, ValueError):
+        pass # 캐시가 없거나 망가졌으면 새로 컴파일합니다.
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    levels = [compile_level(rows, name) for name, rows in parse_pack(raw.decode("utf-8"), stem)]
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 바꿔치기합니다.
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(_pack_bytes(levels))
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass # 캐시를 못 써도 게임은 할 수 있습니다.
+    return levels
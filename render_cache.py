@@ -0,0 +1,68 @@
+import pygame
+from collections import OrderedDict
+
+# 여러 pygame 게임이 함께 쓰는 글자/오버레이 서피스 캐시입니다.
+# 바뀌지 않는 글자나 화면은 한 번만 만들고, 이후에는 blit만 하면 됩니다.
+
+TEXT_CACHE_SIZE = 512
+OVERLAY_CACHE_SIZE = 32
+
+
+class SurfaceCache:
+    """키별로 만든 서피스를 최근 사용 순(LRU)으로 보관하는 캐시"""
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """캐시된 서피스를 돌려줍니다. 없으면 None."""
+        surface = self._items.get(key)
+        if surface is not None:
+            self._items.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        """서피스를 저장하고, 가장 오래 쓰지 않은 항목부터 내보냅니다."""
+        self._items[key] = surface
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._items.clear()
+
+
+text_cache = SurfaceCache(TEXT_CACHE_SIZE)
+overlay_cache = SurfaceCache(OVERLAY_CACHE_SIZE)
+
+
+def render_text(font, text, color, antialias=True):
+    """font.render와 같지만, (폰트, 문자열, 색) 조합마다 한 번만 렌더링합니다."""
+    key = (font, text, antialias, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = text_cache.put(key, font.render(text, antialias, color))
+    return surface
+
+
+def get_overlay(size, color):
+    """주어진 크기와 (반투명) 색으로 채운 SRCALPHA 서피스를 재사용합니다."""
+    key = ("fill", size, color)
+    surface = overlay_cache.get(key)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill(color)
+        overlay_cache.put(key, surface)
+    return surface
+
+
+def get_prebuilt(key, build):
+    """정적인 화면(오버레이 + 글자 등)을 build()로 한 번 만들어 두고 재사용합니다."""
+    surface = overlay_cache.get(key)
+    if surface is None:
+        surface = overlay_cache.put(key, build())
+    return surface
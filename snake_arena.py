@@ -0,0 +1,225 @@
+import random
+import sys
+import time
+from array import array
+from collections import deque
+
+from snake_core import GRID_WIDTH, GRID_HEIGHT, DIRECTIONS, REWARD_FOOD, REWARD_DEATH, FreeCellIndex
+
+# 여러 마리의 뱀이 한 보드를 함께 쓰는 아레나입니다. (화면 없이 동작)
+# 모든 뱀이 칸별 주인 격자 하나를 공유하므로, 충돌 검사는 뱀마다 머리 칸 하나만 보면 됩니다.
+# 틱 비용은 뱀 수에 비례하고 몸통 길이와는 무관합니다.
+
+EMPTY = 0
+FOOD = -1 # 그 밖의 값 n > 0 은 n - 1번 뱀의 몸통입니다.
+FOOD_PER_SNAKE = 0.5
+
+
+class ArenaSnake:
+    """아레나 안의 뱀 한 마리. 몸통은 칸 번호(y * width + x)의 deque입니다."""
+    def __init__(self, index):
+        self.index = index
+        self.body = deque()
+        self.direction = DIRECTIONS[0]
+        self.grow = False
+        self.alive = False
+        self.score = 0
+        self.target = None # 봇이 쫓는 음식 칸
+
+    def change_direction(self, new_direction):
+        """반대 방향으로는 즉시 바꿀 수 없습니다."""
+        if len(self.body) > 1 and (self.direction[0] * -1, self.direction[1] * -1) == new_direction:
+            return
+        self.direction = new_direction
+
+
+class Arena:
+    """num_snakes마리의 뱀과 여러 개의 음식이 있는 보드.
+
+    앞의 players마리는 사람이 조종하고 죽어도 되살아나지 않습니다. 나머지는 봇이며 죽으면 빈 칸에서 다시 태어납니다.
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, num_snakes=2, players=0, food_count=None, seed=None):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.players = players
+        self.food_count = food_count if food_count is not None else max(1, int(num_snakes * FOOD_PER_SNAKE))
+        self.rng = random.Random(seed)
+        self.snakes = [ArenaSnake(i) for i in range(num_snakes)]
+        # 칸마다 EMPTY, FOOD 또는 뱀 번호 + 1. 빈 칸 목록에서 음식과 새 뱀 위치를 O(1)로 뽑습니다.
+        self.grid = array('i', [EMPTY]) * self.size
+        self.free = FreeCellIndex(self.size)
+        self.food_cells = []
+        self.food_slots = {}
+        self.changed = [] # 이번 틱에 내용이 바뀐 칸 (그리기용)
+        self.ticks = 0
+        for snake in self.snakes:
+            self._spawn_snake(snake)
+        self._fill_food()
+
+    # --- 배치 ---
+    def _spawn_snake(self, snake):
+        cell = self.free.choice(self.rng)
+        if cell is None:
+            return False
+        self.free.remove(cell)
+        self.grid[cell] = snake.index + 1
+        snake.body = deque([cell])
+        snake.direction = self.rng.choice(DIRECTIONS)
+        snake.grow = False
+        snake.alive = True
+        snake.score = 0
+        snake.target = None
+        self.changed.append(cell)
+        return True
+
+    def _fill_food(self):
+        while len(self.food_cells) < self.food_count:
+            cell = self.free.choice(self.rng)
+            if cell is None:
+                return
+            self.free.remove(cell)
+            self.grid[cell] = FOOD
+            self.food_slots[cell] = len(self.food_cells)
+            self.food_cells.append(cell)
+            self.changed.append(cell)
+
+    def _take_food(self, cell):
+        """먹힌 음식을 목록에서 뺍니다. 마지막 음식과 자리를 바꿔 O(1)입니다."""
+        slot = self.food_slots.pop(cell)
+        last = self.food_cells.pop()
+        if last != cell:
+            self.food_cells[slot] = last
+            self.food_slots[last] = slot
+
+    def _kill(self, snake):
+        """죽은 뱀의 몸통을 보드에서 치웁니다."""
+        grid, free = self.grid, self.free
+        for cell in snake.body:
+            grid[cell] = EMPTY
+            free.add(cell)
+        self.changed.extend(snake.body)
+        snake.body.clear()
+        snake.alive = False
+
+    # --- 진행 ---
+    def step(self, actions):
+        """모든 뱀을 한 틱 진행합니다. actions[i]는 i번 뱀의 방향 또는 None(직진)입니다.
+
+        (뱀별 보상 목록, 이번 틱에 죽은 뱀 번호 목록)을 돌려줍니다.
+        """
+        width, height, grid = self.width, self.height, self.grid
+        self.changed = []
+        self.ticks += 1
+        rewards = [0] * len(self.snakes)
+
+        # 1) 머리가 들어갈 칸을 구하고, 벽/몸통(꼬리 포함) 충돌을 격자 한 칸으로 확인합니다.
+        moves = {}
+        dead = []
+        for snake, action in zip(self.snakes, actions):
+            if not snake.alive:
+                continue
+            if action is not None:
+                snake.change_direction(action)
+            head = snake.body[0]
+            x, y = head % width + snake.direction[0], head // width + snake.direction[1]
+            if not (0 <= x < width and 0 <= y < height):
+                dead.append(snake)
+                continue
+            cell = y * width + x
+            if grid[cell] > 0:
+                dead.append(snake)
+                continue
+            moves.setdefault(cell, []).append(snake)
+
+        # 2) 같은 칸으로 들어가려는 머리끼리는 함께 죽습니다.
+        movers = []
+        for cell, snakes in moves.items():
+            if len(snakes) > 1:
+                dead.extend(snakes)
+            else:
+                movers.append((cell, snakes[0]))
+
+        # 3) 살아남은 뱀을 이동합니다. 음식을 먹으면 다음 틱에 꼬리가 남아 길어집니다.
+        free = self.free
+        for cell, snake in movers:
+            changed = self.changed
+            changed.append(snake.body[0]) # 머리였던 칸
+            ate = grid[cell] == FOOD
+            snake.body.appendleft(cell)
+            grid[cell] = snake.index + 1
+            free.remove(cell)
+            changed.append(cell)
+            if snake.grow:
+                snake.grow = False
+            else:
+                tail = snake.body.pop()
+                grid[tail] = EMPTY
+                free.add(tail)
+                changed.append(tail)
+            if ate:
+                self._take_food(cell)
+                snake.grow = True
+                snake.score += 1
+                rewards[snake.index] = REWARD_FOOD
+
+        for snake in dead:
+            rewards[snake.index] = REWARD_DEATH
+            self._kill(snake)
+        for snake in dead:
+            if snake.index >= self.players:
+                self._spawn_snake(snake)
+        self._fill_food()
+        return rewards, [snake.index for snake in dead]
+
+    # --- 봇 ---
+    def bot_actions(self):
+        """사람이 아닌 뱀들의 방향을 고릅니다. 뱀마다 O(1)입니다."""
+        actions = [None] * len(self.snakes)
+        for snake in self.snakes[self.players:]:
+            if snake.alive:
+                actions[snake.index] = self._bot_action(snake)
+        return actions
+
+    def _bot_action(self, snake):
+        """쫓는 음식 쪽으로, 바로 앞 칸이 비어 있는 방향 중 가장 가까워지는 쪽을 고릅니다."""
+        width, height, grid = self.width, self.height, self.grid
+        if (snake.target is None or grid[snake.target] != FOOD) and self.food_cells:
+            snake.target = self.rng.choice(self.food_cells)
+        head = snake.body[0]
+        head_x, head_y = head % width, head // width
+        target = snake.target if snake.target is not None else head
+        target_x, target_y = target % width, target // width
+
+        best, best_distance = None, None
+        reverse = (-snake.direction[0], -snake.direction[1])
+        for direction in DIRECTIONS:
+            if direction == reverse and len(snake.body) > 1:
+                continue
+            x, y = head_x + direction[0], head_y + direction[1]
+            if not (0 <= x < width and 0 <= y < height) or grid[y * width + x] > 0:
+                continue
+            distance = abs(target_x - x) + abs(target_y - y)
+            if best_distance is None or distance < best_distance:
+                best, best_distance = direction, distance
+        return best
+
+
+def main():
+    # 사용법: python snake_arena.py [뱀 수] [틱 수]
+    #   봇만으로 아레나를 진행하고 틱/초를 보고합니다.
+    num_snakes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    arena = Arena(200, 150, num_snakes, seed=0)
+    deaths = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        _, dead = arena.step(arena.bot_actions())
+        deaths += len(dead)
+    elapsed = time.perf_counter() - start
+    longest = max(len(snake.body) for snake in arena.snakes)
+    print(f"뱀 {num_snakes}마리, {ticks}틱: {ticks / elapsed:,.0f}틱/초, 죽음 {deaths}회, 최장 길이 {longest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import sys
+import time
+from array import array
+from collections import deque
+
+from snake_core import GRID_WIDTH, GRID_HEIGHT, DIRECTIONS, SnakeGame
+
+# 해밀턴 순환을 기본 경로로 삼고, 안전할 때만 음식 쪽으로 지름길을 타는 자동 조종기입니다.
+# 순환 순서상 '머리 앞 ~ 꼬리 뒤' 구간으로만 건너뛰므로 몸통은 항상 순환의 한 구간 위에 남아 충돌하지 않습니다.
+
+DEFAULT_BUDGET_MS = 2.0
+SAFETY_MARGIN = 3 # 지름길 뒤에 남겨 둘 여유 칸 수
+TIME_CHECK_EVERY = 32 # 거리장 계산 중 시간 확인 간격(노드 수)
+MAX_TIMINGS = 100_000
+UNREACHED = 1 << 30
+
+
+def build_hamiltonian_cycle(width, height):
+    """격자 전체를 한 번씩 도는 순환을 칸 번호(y * width + x) 목록으로 만듭니다. 한 변은 짝수여야 합니다."""
+    if height % 2 == 0 and width >= 2:
+        # 첫 줄을 오른쪽으로, 나머지 줄은 x=1..width-1을 지그재그로 내려간 뒤 x=0 열로 올라옵니다.
+        order = [(x, 0) for x in range(width)]
+        for y in range(1, height):
+            xs = range(width - 1, 0, -1) if y % 2 == 1 else range(1, width)
+            order.extend((x, y) for x in xs)
+        order.extend((0, y) for y in range(height - 1, 0, -1))
+        return [y * width + x for x, y in order]
+    if width % 2 == 0 and height >= 2:
+        transposed = build_hamiltonian_cycle(height, width)
+        return [(cell % height) * width + cell // height for cell in transposed]
+    raise ValueError("해밀턴 순환을 만들려면 가로나 세로 중 하나가 짝수여야 합니다.")
+
+
+class Autopilot:
+    """스네이크 자동 조종기. 틱마다 decide()로 다음 방향을 고릅니다.
+
+    음식까지의 BFS 거리장은 음식이 바뀔 때만 새로 계산하고, 꼬리가 비운 칸은 틱마다 점진적으로 반영합니다.
+    한 번의 결정에 budget_ms 이상 쓰지 않으며, 계산이 끝나지 않았으면 다음 틱에 이어서 합니다.
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, budget_ms=DEFAULT_BUDGET_MS):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.budget = budget_ms / 1000
+
+        cycle = build_hamiltonian_cycle(width, height)
+        self.cycle_index = array('i', [0]) * self.size
+        for i, cell in enumerate(cycle):
+            self.cycle_index[cell] = i
+        self.cycle_next = array('i', [0]) * self.size
+        for i, cell in enumerate(cycle):
+            self.cycle_next[cell] = cycle[(i + 1) % self.size]
+
+        self.neighbors = []
+        for cell in range(self.size):
+            x, y = cell % width, cell // width
+            self.neighbors.append(tuple(
+                (y + dy) * width + (x + dx) for dx, dy in DIRECTIONS
+                if 0 <= x + dx < width and 0 <= y + dy < height
+            ))
+
+        self._unreached = array('i', [UNREACHED]) * self.size
+        self.timings = deque(maxlen=MAX_TIMINGS)
+        self.reset()
+
+    def reset(self):
+        """새 게임을 위해 거리장을 비웁니다. (통계는 유지합니다)"""
+        self.dist = self._unreached[:]
+        self.queue = deque()
+        self.field_food = None
+        self.last_tail = None
+
+    # --- 거리장 ---
+    def _start_field(self, food):
+        self.dist = self._unreached[:]
+        self.dist[food] = 0
+        self.queue = deque([food])
+        self.field_food = food
+
+    def _open_cell(self, cell):
+        """꼬리가 비운 칸을 거리장에 반영합니다. 짧아진 거리는 큐를 통해 주변으로 퍼집니다."""
+        dist = self.dist
+        best = min(dist[n] for n in self.neighbors[cell])
+        if best + 1 < dist[cell]:
+            dist[cell] = best + 1
+            self.queue.append(cell)
+
+    def _advance_field(self, occupied, deadline):
+        """마감 시각까지 거리장 전파를 진행합니다. 끝나면 True."""
+        dist, queue, neighbors = self.dist, self.queue, self.neighbors
+        processed = 0
+        while queue:
+            cell = queue.popleft()
+            next_dist = dist[cell] + 1
+            for n in neighbors[cell]:
+                if next_dist < dist[n] and not occupied[n]:
+                    dist[n] = next_dist
+                    queue.append(n)
+            processed += 1
+            if processed % TIME_CHECK_EVERY == 0 and time.perf_counter() >= deadline:
+                return not queue
+        return True
+
+    # --- 결정 ---
+    def decide(self, snake, food):
+        """snake가 이번 틱에 갈 방향을 돌려줍니다. food는 음식 위치 (x, y) 또는 None."""
+        start = time.perf_counter()
+        width = self.width
+        head_x, head_y = snake.body[0]
+        tail_x, tail_y = snake.body[-1]
+        head = head_y * width + head_x
+        tail = tail_y * width + tail_x
+        occupied = snake.occupied
+
+        food_cell = food[1] * width + food[0] if food is not None else None
+        if food_cell is not None and food_cell != self.field_food:
+            self._start_field(food_cell)
+        elif self.last_tail is not None and self.last_tail != tail and not occupied[self.last_tail]:
+            self._open_cell(self.last_tail)
+        self.last_tail = tail
+        field_ready = self._advance_field(occupied, start + self.budget)
+
+        target = self._choose(snake, head, tail, food_cell, occupied, field_ready)
+        self.timings.append(time.perf_counter() - start)
+        return ((target % width) - head_x, (target // width) - head_y)
+
+    def _choose(self, snake, head, tail, food_cell, occupied, field_ready):
+        size, index = self.size, self.cycle_index
+        head_index = index[head]
+        cycle_next = self.cycle_next[head]
+
+        # 순환 순서로 머리에서 꼬리까지의 빈 구간 안에서만 건너뜁니다. 몸이 길어지면 순환만 따라갑니다.
+        length = len(snake.body) + (1 if snake.grow else 0)
+        if length * 2 >= size:
+            limit = 1
+        else:
+            limit = (index[tail] - head_index) % size - SAFETY_MARGIN - length // 16
+            if food_cell is not None:
+                limit = min(limit, (index[food_cell] - head_index) % size)
+            limit = max(limit, 1)
+
+        dist = self.dist
+        best, best_key = None, None
+        for n in self.neighbors[head]:
+            if occupied[n]:
+                continue
+            skip = (index[n] - head_index) % size
+            if skip > limit:
+                continue
+            # 거리장이 준비됐으면 음식까지 더 가까운 칸, 아니면 순환에서 더 멀리 건너뛰는 칸을 고릅니다.
+            key = (dist[n] if field_ready else 0, -skip)
+            if best_key is None or key < best_key:
+                best, best_key = n, key
+        if best is None:
+            best = cycle_next
+        return best
+
+    def stats(self):
+        """(평균 ms, p99 ms, 결정 횟수)"""
+        if not self.timings:
+            return 0.0, 0.0, 0
+        ordered = sorted(self.timings)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return sum(ordered) / len(ordered) * 1000, p99 * 1000, len(ordered)
+
+
+def main():
+    # 사용법: python snake_autopilot.py [게임 수] [틱당 예산 ms]
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET_MS
+    autopilot = Autopilot(budget_ms=budget_ms)
+    for seed in range(games):
+        game = SnakeGame(seed=seed)
+        autopilot.reset()
+        done = False
+        while not done:
+            _, _, done = game.step(autopilot.decide(game.snake, game.food.position))
+        result = "보드 클리어" if game.cleared else "게임 오버"
+        print(f"게임 {seed}: {result}, 점수 {game.score}, {game.ticks}틱")
+    avg_ms, p99_ms, count = autopilot.stats()
+    print(f"결정 {count}회: 평균 {avg_ms:.3f} ms, p99 {p99_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
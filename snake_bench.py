@@ -0,0 +1,67 @@
+import sys
+import time
+from collections import deque
+
+from snake_core import Snake, RIGHT
+
+# 뱀 길이에 따른 이동 속도(틱/초)를 측정합니다.
+# 사용법: python snake_bench.py [틱 수]
+
+LENGTHS = [5, 50, 500, 1000]
+DEFAULT_TICKS = 200_000
+
+
+def make_snake(length, ticks):
+    """한 줄짜리 긴 보드 위에 길이 length의 뱀을 오른쪽을 향해 눕혀 놓습니다."""
+    snake = Snake(width=length + ticks + 1, height=1)
+    snake.body = deque((x, 0) for x in range(length - 1, -1, -1))
+    snake.occupied = bytearray(snake.width)
+    snake.free.reset()
+    for x, _ in snake.body:
+        snake.occupied[x] = 1
+        snake.free.remove(x)
+    snake.direction = RIGHT
+    return snake
+
+
+def legacy_move(body, direction, width, height):
+    """이전 구현(list + body[1:] 검사)과 같은 방식의 이동. 비교용입니다."""
+    head_x, head_y = body[0]
+    new_head = (head_x + direction[0], head_y + direction[1])
+    if not (0 <= new_head[0] < width and 0 <= new_head[1] < height):
+        return False
+    if len(body) > 1 and new_head in body[1:]:
+        return False
+    body.insert(0, new_head)
+    body.pop()
+    return True
+
+
+def bench(length, ticks):
+    snake = make_snake(length, ticks)
+    move = snake.move
+    start = time.perf_counter()
+    for _ in range(ticks):
+        move()
+    current = ticks / (time.perf_counter() - start)
+
+    body = list(make_snake(length, ticks).body)
+    width = length + ticks + 1
+    legacy_ticks = max(ticks // 20, 1000)
+    start = time.perf_counter()
+    for _ in range(legacy_ticks):
+        legacy_move(body, RIGHT, width, 1)
+    legacy = legacy_ticks / (time.perf_counter() - start)
+    return current, legacy
+
+
+def main():
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TICKS
+    print(f"{'길이':>6} {'deque+비트맵 틱/초':>20} {'이전 list 틱/초':>18}")
+    for length in LENGTHS:
+        current, legacy = bench(length, ticks)
+        print(f"{length:>6} {current:>20,.0f} {legacy:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
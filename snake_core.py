@@ -0,0 +1,266 @@
+import random
+from array import array
+from collections import deque
+
+# --- 상수 ---
+GRID_WIDTH = 40
+GRID_HEIGHT = 30
+
+# --- 방향 ---
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# --- 보상 ---
+REWARD_FOOD = 1
+REWARD_DEATH = -1
+
+
+# --- 클래스 정의 ---
+# 화면(pygame) 없이 동작하는 스네이크 규칙입니다. 그리기는 각 게임 파일이 담당합니다.
+
+class FreeCellIndex:
+    """빈 칸(y * width + x) 목록. 추가, 제거, 무작위 선택이 모두 O(1)입니다."""
+    def __init__(self, size):
+        self.size = size
+        self._identity = array('i', range(size))
+        self.reset()
+
+    def reset(self):
+        """모든 칸을 빈 칸으로 되돌립니다. 같은 시드면 같은 결과가 나오도록 순서도 초기화합니다."""
+        # cells의 앞쪽 count개가 빈 칸이고, slots[칸]은 cells 안에서의 위치입니다.
+        self.cells = self._identity[:]
+        self.slots = self._identity[:]
+        self.count = self.size
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, cell):
+        return self.slots[cell] < self.count
+
+    def remove(self, cell):
+        """칸을 사용 중으로 표시합니다. 빈 칸 구간의 마지막 칸과 자리를 바꿉니다."""
+        cells, slots = self.cells, self.slots
+        slot = slots[cell]
+        last = self.count - 1
+        if slot > last:
+            return
+        other = cells[last]
+        cells[slot] = other
+        slots[other] = slot
+        cells[last] = cell
+        slots[cell] = last
+        self.count = last
+
+    def add(self, cell):
+        """칸을 다시 빈 칸으로 표시합니다."""
+        cells, slots = self.cells, self.slots
+        slot = slots[cell]
+        first = self.count
+        if slot < first:
+            return
+        other = cells[first]
+        cells[slot] = other
+        slots[other] = slot
+        cells[first] = cell
+        slots[cell] = first
+        self.count = first + 1
+
+    def choice(self, rng=random):
+        """빈 칸 하나를 무작위로 고릅니다. 빈 칸이 없으면 None."""
+        if self.count == 0:
+            return None
+        return self.cells[rng.randrange(self.count)]
+
+class Snake:
+    """뱀의 로직을 관리하는 클래스
+
+    wrap이면 화면 경계를 넘을 때 반대편으로 나옵니다. start_direction이 None이면 시작 방향은 무작위입니다.
+    """
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, rng=random, wrap=False, start_direction=None):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.wrap = wrap
+        self.start_direction = start_direction
+        # 음식 위치를 한 번에 고를 수 있도록 빈 칸 목록도 함께 갱신합니다.
+        self.free = FreeCellIndex(width * height)
+        self.reset()
+
+    def reset(self):
+        """뱀을 초기 상태로 리셋합니다."""
+        start = (self.width // 2, self.height // 2)
+        # 몸통 순서는 deque로, 칸 점유 여부는 격자 비트맵으로 관리해 길이와 무관하게 O(1)로 이동합니다.
+        self.body = deque([start])
+        self.occupied = bytearray(self.width * self.height)
+        self.occupied[start[1] * self.width + start[0]] = 1
+        self.free.reset()
+        self.free.remove(start[1] * self.width + start[0])
+        if self.start_direction is None:
+            self.direction = self.rng.choice(DIRECTIONS)
+        else:
+            self.direction = self.start_direction
+        self.grow = False
+
+    def __contains__(self, position):
+        """해당 칸을 뱀의 몸이 차지하고 있는지 O(1)로 확인합니다."""
+        x, y = position
+        return 0 <= x < self.width and 0 <= y < self.height and self.occupied[y * self.width + x] == 1
+
+    def move(self):
+        """뱀을 현재 방향으로 한 칸 이동시킵니다."""
+        head_x, head_y = self.body[0]
+        dir_x, dir_y = self.direction
+        x, y = head_x + dir_x, head_y + dir_y
+
+        # 화면 경계를 벗어났는지 확인
+        if self.wrap:
+            x %= self.width
+            y %= self.height
+        elif not (0 <= x < self.width and 0 <= y < self.height):
+            return False # 게임 오버
+
+        # 머리가 몸통의 다른 부분과 충돌했는지 확인합니다. (꼬리 칸도 충돌로 봅니다)
+        occupied = self.occupied
+        cell = y * self.width + x
+        if occupied[cell]:
+            return False # 게임 오버
+
+        self.body.appendleft((x, y))
+        occupied[cell] = 1
+
+        if self.grow:
+            self.grow = False
+            self.free.remove(cell)
+        else:
+            tail_x, tail_y = self.body.pop()
+            tail = tail_y * self.width + tail_x
+            occupied[tail] = 0
+            # 머리가 들어간 칸과 꼬리가 비운 칸의 자리만 맞바꾸면 빈 칸 목록이 그대로 유지됩니다.
+            free = self.free
+            cells, slots = free.cells, free.slots
+            head_slot, tail_slot = slots[cell], slots[tail]
+            cells[head_slot] = tail
+            slots[tail] = head_slot
+            cells[tail_slot] = cell
+            slots[cell] = tail_slot
+
+        return True
+
+    def change_direction(self, new_direction):
+        """뱀의 이동 방향을 변경합니다. 단, 반대 방향으로는 즉시 변경할 수 없습니다."""
+        if len(self.body) > 1 and (self.direction[0] * -1, self.direction[1] * -1) == new_direction:
+            return
+        self.direction = new_direction
+
+    def grow_snake(self):
+        """뱀의 몸을 한 칸 늘립니다."""
+        self.grow = True
+
+class Food:
+    """음식의 로직을 관리하는 클래스"""
+    def __init__(self, snake, width=GRID_WIDTH, height=GRID_HEIGHT, rng=random):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.position = (0, 0)
+        self.randomize_position(snake)
+
+    def randomize_position(self, snake):
+        """음식의 위치를 뱀의 몸과 겹치지 않는 무작위 위치로 변경합니다.
+
+        빈 칸 목록에서 한 번만 뽑습니다. 보드가 가득 차 놓을 곳이 없으면 False를 돌려줍니다.
+        """
+        cell = snake.free.choice(self.rng)
+        if cell is None:
+            self.position = None
+            return False
+        self.position = (cell % self.width, cell // self.width)
+        return True
+
+class SnakeGame:
+    """화면과 프레임 제한 없이 한 판을 진행하는 엔진. 봇 학습과 회귀 테스트용입니다."""
+    def __init__(self, width=GRID_WIDTH, height=GRID_HEIGHT, rng=None, seed=None, wrap=False, start_direction=None):
+        self.width = width
+        self.height = height
+        # 게임마다 자체 난수 생성기를 써서, 같은 시드면 같은 입력에 같은 결과가 나옵니다.
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.wrap = wrap
+        self.start_direction = start_direction
+        self.snake = Snake(width, height, self.rng, wrap, start_direction)
+        self.food = Food(self.snake, width, height, self.rng)
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+        self.cleared = False
+
+    def reset(self, seed=None):
+        """새 게임을 시작하고 첫 상태를 돌려줍니다. seed를 주면 난수 생성기를 다시 시드합니다."""
+        if seed is not None:
+            self.rng.seed(seed)
+        self.snake.reset()
+        self.food.randomize_position(self.snake)
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+        self.cleared = False
+        return self.state()
+
+    def snapshot(self):
+        """리플레이 탐색용으로 현재 게임 상태 전체를 복사해 둡니다."""
+        snake, free = self.snake, self.snake.free
+        return (
+            deque(snake.body), bytearray(snake.occupied), free.cells[:], free.slots[:], free.count,
+            snake.direction, snake.grow, self.food.position, self.score, self.ticks,
+            self.done, self.cleared, self.rng.getstate(),
+        )
+
+    def restore(self, snapshot):
+        """snapshot()으로 저장한 상태로 되돌립니다."""
+        snake, free = self.snake, self.snake.free
+        (body, occupied, cells, slots, free.count,
+         snake.direction, snake.grow, self.food.position, self.score, self.ticks,
+         self.done, self.cleared, rng_state) = snapshot
+        snake.body = deque(body)
+        snake.occupied = bytearray(occupied)
+        free.cells = cells[:]
+        free.slots = slots[:]
+        self.rng.setstate(rng_state)
+
+    def state(self):
+        """(머리 위치, 방향, 음식 위치, 길이) 형태의 현재 상태."""
+        snake = self.snake
+        return snake.body[0], snake.direction, self.food.position, len(snake.body)
+
+    def step(self, action=None):
+        """한 틱을 진행합니다. action은 방향(UP/DOWN/LEFT/RIGHT) 또는 None(직진)입니다.
+
+        (state, reward, done)을 돌려줍니다.
+        """
+        if self.done:
+            return self.state(), 0, True
+
+        snake = self.snake
+        if action is not None:
+            snake.change_direction(action)
+
+        self.ticks += 1
+        if not snake.move():
+            self.done = True
+            return self.state(), REWARD_DEATH, True
+
+        reward = 0
+        if snake.body[0] == self.food.position:
+            snake.grow_snake()
+            self.score += 1
+            reward = REWARD_FOOD
+            if not self.food.randomize_position(snake):
+                # 빈 칸이 하나도 없으면 보드를 다 채운 것입니다.
+                self.cleared = True
+                self.done = True
+                return self.state(), reward, True
+
+        return self.state(), reward, False
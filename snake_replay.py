@@ -0,0 +1,240 @@
+import struct
+import sys
+import time
+from bisect import bisect_right
+
+from snake_core import GRID_WIDTH, GRID_HEIGHT, DIRECTIONS, SnakeGame
+
+# 스네이크 한 판을 시드 + 틱별 입력으로 기록하는 작은 이진 리플레이 형식입니다.
+#
+# 헤더(little endian): 매직 "SNKR", 버전 u8, 플래그 u8(bit0 = 경계 통과), 가로 u16, 세로 u16,
+#   시작 방향 u8(0 = 무작위, 1~4 = DIRECTIONS 순서), 시드 u64, 틱 수 u32, 점수 u32, 결과 u8
+# 본문: 입력 런마다 varint 하나 = (반복 틱 수 << 3) | 입력 코드(0 = 직진, 1~4 = DIRECTIONS 순서)
+# 레코드는 틱 수만큼 런을 읽으면 끝나므로, 여러 판을 그냥 이어 붙여 한 파일에 보관할 수 있습니다.
+
+MAGIC = b"SNKR"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHHBQIIB")
+FLAG_WRAP = 1
+ACTION_BITS = 3
+CODE_ACTIONS = (None,) + DIRECTIONS
+ACTION_CODES = {action: code for code, action in enumerate(CODE_ACTIONS)}
+CHECKPOINT_EVERY = 1000
+
+# --- 결과 ---
+RESULT_PLAYING = 0
+RESULT_GAME_OVER = 1
+RESULT_CLEARED = 2
+
+
+class ReplayError(ValueError):
+    """리플레이 데이터가 손상되었거나 지원하지 않는 형식일 때"""
+
+
+def game_result(game):
+    if game.cleared:
+        return RESULT_CLEARED
+    if game.done:
+        return RESULT_GAME_OVER
+    return RESULT_PLAYING
+
+
+class Replay:
+    """한 판의 기록: 시드와 보드 설정, 틱별 입력(런 길이 부호화), 최종 점수와 결과"""
+    def __init__(self, seed, width=GRID_WIDTH, height=GRID_HEIGHT, wrap=False, start_direction=None):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.start_direction = start_direction
+        self.runs = [] # [반복 틱 수, 입력 코드]
+        self.ticks = 0
+        self.score = 0
+        self.result = RESULT_PLAYING
+
+    @classmethod
+    def for_game(cls, game, seed):
+        """game.reset(seed)로 막 시작한 게임을 기록할 리플레이를 만듭니다."""
+        return cls(seed, game.width, game.height, game.wrap, game.start_direction)
+
+    def new_game(self):
+        """기록과 같은 설정과 시드로 새 게임을 만듭니다."""
+        return SnakeGame(self.width, self.height, seed=self.seed, wrap=self.wrap,
+                         start_direction=self.start_direction)
+
+    def record(self, action):
+        """game.step(action)에 넘긴 입력을 한 틱 기록합니다."""
+        code = ACTION_CODES[action]
+        runs = self.runs
+        if runs and runs[-1][1] == code:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, code])
+        self.ticks += 1
+
+    def finish(self, game):
+        """게임이 끝난 뒤 점수와 결과를 기록합니다."""
+        self.score = game.score
+        self.result = game_result(game)
+
+    def actions(self):
+        """틱마다 입력을 하나씩 돌려줍니다."""
+        for count, code in self.runs:
+            action = CODE_ACTIONS[code]
+            for _ in range(count):
+                yield action
+
+    # --- 직렬화 ---
+    def to_bytes(self):
+        start_code = 0 if self.start_direction is None else ACTION_CODES[self.start_direction]
+        flags = FLAG_WRAP if self.wrap else 0
+        out = bytearray(HEADER.pack(MAGIC, VERSION, flags, self.width, self.height, start_code,
+                                    self.seed, self.ticks, self.score, self.result))
+        for count, code in self.runs:
+            value = (count << ACTION_BITS) | code
+            while value >= 0x80:
+                out.append((value & 0x7F) | 0x80)
+                value >>= 7
+            out.append(value)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data, offset=0):
+        """data[offset:]에서 리플레이 하나를 읽고 (리플레이, 다음 오프셋)을 돌려줍니다."""
+        if len(data) - offset < HEADER.size:
+            raise ReplayError("리플레이 헤더가 잘렸습니다.")
+        (magic, version, flags, width, height, start_code,
+         seed, ticks, score, result) = HEADER.unpack_from(data, offset)
+        if magic != MAGIC:
+            raise ReplayError("스네이크 리플레이가 아닙니다.")
+        if version != VERSION:
+            raise ReplayError(f"지원하지 않는 리플레이 버전입니다: {version}")
+        replay = cls(seed, width, height, bool(flags & FLAG_WRAP), CODE_ACTIONS[start_code])
+        replay.score = score
+        replay.result = result
+
+        pos = offset + HEADER.size
+        total = 0
+        runs = replay.runs
+        while total < ticks:
+            value = shift = 0
+            while True:
+                if pos >= len(data):
+                    raise ReplayError("리플레이 입력 데이터가 잘렸습니다.")
+                byte = data[pos]
+                pos += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            count, code = value >> ACTION_BITS, value & ((1 << ACTION_BITS) - 1)
+            if code >= len(CODE_ACTIONS) or count == 0:
+                raise ReplayError("잘못된 입력 런입니다.")
+            runs.append([count, code])
+            total += count
+        if total != ticks:
+            raise ReplayError("입력 런의 합이 틱 수와 다릅니다.")
+        replay.ticks = ticks
+        return replay, pos
+
+
+# --- 파일 ---
+def append_replay(path, replay):
+    """리플레이 하나를 보관 파일 끝에 덧붙입니다."""
+    with open(path, "ab") as f:
+        f.write(replay.to_bytes())
+
+def iter_replays(path):
+    """보관 파일에 들어 있는 리플레이를 차례로 돌려줍니다."""
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset < len(data):
+        replay, offset = Replay.from_bytes(data, offset)
+        yield replay
+
+
+# --- 재생 ---
+def play(replay):
+    """화면 없이 최고 속도로 끝까지 재생하고 마지막 게임 상태를 돌려줍니다."""
+    game = replay.new_game()
+    step = game.step
+    for count, code in replay.runs:
+        action = CODE_ACTIONS[code]
+        for _ in range(count):
+            step(action)
+    return game
+
+def verify(replay):
+    """현재 규칙으로 다시 재생해 기록된 점수, 틱 수, 결과가 그대로 나오는지 확인합니다."""
+    game = play(replay)
+    return game.score == replay.score and game.ticks == replay.ticks and game_result(game) == replay.result
+
+
+class ReplayPlayer:
+    """원하는 틱으로 바로 이동할 수 있는 재생기. 일정 틱마다 상태 체크포인트를 남깁니다."""
+    def __init__(self, replay, checkpoint_every=CHECKPOINT_EVERY):
+        self.replay = replay
+        self.checkpoint_every = checkpoint_every
+        self.game = replay.new_game()
+        self.checkpoints = [self.game.snapshot()]
+        # 런마다 시작 틱을 미리 구해 두면 임의의 틱의 입력을 이분 탐색으로 찾을 수 있습니다.
+        self.run_starts = []
+        tick = 0
+        for count, _ in replay.runs:
+            self.run_starts.append(tick)
+            tick += count
+
+    @property
+    def tick(self):
+        return self.game.ticks
+
+    def seek(self, tick):
+        """tick번째 틱이 끝난 상태로 이동하고 게임을 돌려줍니다."""
+        tick = max(0, min(tick, self.replay.ticks))
+        every = self.checkpoint_every
+        index = min(tick // every, len(self.checkpoints) - 1)
+        # 뒤로 가거나, 더 가까운 체크포인트가 있으면 그 지점에서 다시 시작합니다.
+        if tick < self.game.ticks or index * every > self.game.ticks:
+            self.game.restore(self.checkpoints[index])
+
+        game, runs = self.game, self.replay.runs
+        run = bisect_right(self.run_starts, game.ticks) - 1
+        while game.ticks < tick and not game.done:
+            count, code = runs[run]
+            if game.ticks >= self.run_starts[run] + count:
+                run += 1
+                continue
+            game.step(CODE_ACTIONS[code])
+            if game.ticks % every == 0 and game.ticks // every == len(self.checkpoints):
+                self.checkpoints.append(game.snapshot())
+        return game
+
+
+def main():
+    # 사용법: python snake_replay.py 보관파일 [--tick N]
+    #   보관 파일의 모든 판을 다시 재생해 결과를 검증하고 속도를 보고합니다.
+    #   --tick N을 주면 첫 판의 N번째 틱 상태를 보여 줍니다.
+    if len(sys.argv) < 2:
+        print("사용법: python snake_replay.py 보관파일 [--tick N]")
+        sys.exit(1)
+    path = sys.argv[1]
+    if "--tick" in sys.argv:
+        tick = int(sys.argv[sys.argv.index("--tick") + 1])
+        game = ReplayPlayer(next(iter_replays(path))).seek(tick)
+        print(f"틱 {game.ticks}: 머리 {game.snake.body[0]}, 길이 {len(game.snake.body)}, 점수 {game.score}")
+        return
+
+    games = ticks = mismatches = 0
+    start = time.perf_counter()
+    for replay in iter_replays(path):
+        games += 1
+        ticks += replay.ticks
+        if not verify(replay):
+            mismatches += 1
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"{games}판 재생, 불일치 {mismatches}판, {games / elapsed:,.0f}판/초, {ticks / elapsed:,.0f}틱/초")
+
+
+if __name__ == "__main__":
+    main()
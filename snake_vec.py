@@ -0,0 +1,128 @@
+import numpy as np
+
+from snake_core import GRID_WIDTH, GRID_HEIGHT, DIRECTIONS, REWARD_FOOD, REWARD_DEATH
+
+# 여러 판의 스네이크를 NumPy 배열 연산으로 한꺼번에 진행합니다. (학습용 벡터 환경)
+# 행동 번호는 DIRECTIONS 순서(0=UP, 1=DOWN, 2=LEFT, 3=RIGHT)이고, -1은 직진입니다.
+
+DIR_X = np.array([d[0] for d in DIRECTIONS], dtype=np.int32)
+DIR_Y = np.array([d[1] for d in DIRECTIONS], dtype=np.int32)
+OPPOSITE = np.array([DIRECTIONS.index((-dx, -dy)) for dx, dy in DIRECTIONS], dtype=np.int8)
+
+
+class VecSnakeEnv:
+    """N개의 독립된 스네이크 게임을 배치로 진행하는 환경.
+
+    몸통은 판마다 칸별 '머리가 들어온 틱'(entered)으로 저장합니다.
+    entered > tick - length 인 칸이 현재 몸통이므로, 이동·충돌·리셋이 모두 길이와 무관한 O(1) 배열 연산입니다.
+    """
+    def __init__(self, num_envs, width=GRID_WIDTH, height=GRID_HEIGHT, seed=None, auto_reset=True):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        self._index = np.arange(num_envs)
+
+        self.head_x = np.zeros(num_envs, dtype=np.int32)
+        self.head_y = np.zeros(num_envs, dtype=np.int32)
+        self.direction = np.zeros(num_envs, dtype=np.int8)
+        self.length = np.ones(num_envs, dtype=np.int32)
+        self.grow = np.zeros(num_envs, dtype=bool)
+        self.food = np.zeros(num_envs, dtype=np.int32)
+        self.score = np.zeros(num_envs, dtype=np.int32)
+        self.tick = np.zeros(num_envs, dtype=np.int32)
+        self.entered = np.full((num_envs, self.cells), -1, dtype=np.int32)
+        self.reset()
+
+    def reset(self, mask=None):
+        """mask가 True인 판(없으면 전부)을 새 게임으로 되돌리고 관측값을 돌려줍니다."""
+        envs = self._index if mask is None else self._index[mask]
+        count = len(envs)
+        if count:
+            # 틱만 하나 올리면 이전 판의 몸통 칸은 모두 entered <= tick - 1 이 되어 자동으로 비워집니다.
+            self.tick[envs] += 1
+            self.head_x[envs] = self.width // 2
+            self.head_y[envs] = self.height // 2
+            start = self.height // 2 * self.width + self.width // 2
+            self.entered[envs, start] = self.tick[envs]
+            self.direction[envs] = self.rng.integers(0, 4, count)
+            self.length[envs] = 1
+            self.grow[envs] = False
+            self.score[envs] = 0
+            # 시작 칸을 제외한 나머지 칸 중에서 음식 위치를 고릅니다.
+            food = self.rng.integers(0, self.cells - 1, count)
+            self.food[envs] = food + (food >= start)
+        return self.observe()
+
+    def observe(self):
+        """판마다 [머리 x, 머리 y, 방향, 음식 x, 음식 y, 길이]를 담은 (N, 6) 배열."""
+        return np.stack([
+            self.head_x, self.head_y, self.direction,
+            self.food % self.width, self.food // self.width, self.length,
+        ], axis=1)
+
+    def occupancy(self):
+        """판마다 몸통이 차지한 칸을 (N, height, width) bool 배열로 돌려줍니다."""
+        occupied = self.entered > (self.tick - self.length)[:, None]
+        return occupied.reshape(self.num_envs, self.height, self.width)
+
+    def step(self, actions):
+        """모든 판을 한 틱 진행합니다. (observations, rewards, dones)를 돌려줍니다.
+
+        auto_reset이면 끝난 판은 곧바로 새 게임으로 바뀌고, 돌려주는 관측값은 새 게임의 것입니다.
+        """
+        actions = np.asarray(actions, dtype=np.int8)
+        direction = self.direction
+
+        # 반대 방향 전환은 길이가 2 이상일 때 무시합니다.
+        turn = (actions >= 0) & ~((self.length > 1) & (actions == OPPOSITE[direction]))
+        np.copyto(direction, actions, where=turn)
+
+        new_x = self.head_x + DIR_X[direction]
+        new_y = self.head_y + DIR_Y[direction]
+        out = (new_x < 0) | (new_x >= self.width) | (new_y < 0) | (new_y >= self.height)
+        cell = np.where(out, 0, new_y * self.width + new_x)
+
+        # 꼬리 칸까지 포함한 현재 몸통과의 충돌 검사
+        hit = self.entered[self._index, cell] > self.tick - self.length
+        dead = out | hit
+        alive = ~dead
+
+        moved = self._index[alive]
+        moved_cell = cell[alive]
+        self.tick[moved] += 1
+        self.entered[moved, moved_cell] = self.tick[moved]
+        self.head_x[moved] = new_x[alive]
+        self.head_y[moved] = new_y[alive]
+        # 음식을 먹은 다음 틱에 꼬리가 남아 길이가 늘어납니다.
+        self.length[moved] += self.grow[moved]
+        self.grow[moved] = False
+
+        ate = alive & (cell == self.food)
+        rewards = np.where(ate, REWARD_FOOD, 0).astype(np.int32)
+        rewards[dead] = REWARD_DEATH
+        dones = dead.copy()
+
+        eaters = self._index[ate]
+        if len(eaters):
+            self.grow[eaters] = True
+            self.score[eaters] += 1
+            # 성장할 몸통까지 포함해 빈 칸이 없으면 보드 클리어로 끝냅니다.
+            cleared = self.length[eaters] >= self.cells
+            dones[eaters[cleared]] = True
+            self._spawn_food(eaters[~cleared])
+
+        if self.auto_reset and dones.any():
+            self.reset(dones)
+        return self.observe(), rewards, dones
+
+    def _spawn_food(self, envs):
+        """빈 칸마다 난수를 매겨 가장 큰 칸을 고르는 방식으로, 판마다 한 번에 빈 칸 하나를 뽑습니다."""
+        if not len(envs):
+            return
+        occupied = self.entered[envs] > (self.tick[envs] - self.length[envs])[:, None]
+        keys = self.rng.random((len(envs), self.cells))
+        keys[occupied] = -1.0
+        self.food[envs] = keys.argmax(axis=1)
@@ -1,14 +1,20 @@
 import pygame
 import sys
-import random
 import os
+import random
+from collections import deque
+
+from frame_profiler import profiler_from_args
+from render_cache import render_text, get_overlay
+from snake_arena import Arena, EMPTY, FOOD
+from snake_autopilot import Autopilot
+from snake_core import GRID_WIDTH, GRID_HEIGHT, UP, DOWN, LEFT, RIGHT, SnakeGame
+from snake_replay import Replay, append_replay
 
 # --- 상수 ---
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
 GRID_SIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRID_SIZE
+SCREEN_WIDTH = GRID_WIDTH * GRID_SIZE
+SCREEN_HEIGHT = GRID_HEIGHT * GRID_SIZE
 
 # --- 색상 (현대적인 느낌의 색상 팔레트) ---
 COLOR_BACKGROUND = (20, 20, 20)
@@ -19,22 +25,30 @@ COLOR_TEXT = (230, 230, 230) # 밝은 회색
 COLOR_GRID = (30, 30, 30) # 어두운 회색
 COLOR_OVERLAY = (0, 0, 0, 170) # 반투명 검정
 
-# --- 방향 ---
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# --- 타이밍 ---
+RENDER_FPS = 60 # 화면/입력 갱신 빈도. 시뮬레이션 빈도는 game_speed(틱/초)입니다.
+MAX_STEPS_PER_FRAME = 5 # 프레임이 크게 밀려도 한 번에 따라잡는 최대 틱 수
+INPUT_QUEUE_SIZE = 3 # 틱마다 하나씩 적용할 방향 입력의 최대 대기 수
+ATTRACT_DELAY_MS = 2000 # 자동 조종(데모) 중 시작/게임 오버 화면에 머무는 시간
+DIRECTION_KEYS = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+
+# --- 아레나 ---
+ARENA_CELL_SIZE = 5
+ARENA_SNAKES = 200
+ARENA_SPEED = 12 # 틱/초
 
 # --- 게임 상태 ---
 START = 0
 PLAYING = 1
 GAME_OVER = 2
+CLEARED = 3
 
 # --- Pygame 초기화 ---
 pygame.init()
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("스네이크 게임")
 clock = pygame.time.Clock()
+profiler = profiler_from_args("스네이크 2.0")
 
 # --- 폰트 로드 ---
 # 한글을 지원하는 시스템 폰트를 찾습니다.
@@ -77,83 +91,27 @@ except (FileNotFoundError, pygame.error):
     font_large = pygame.font.Font(None, 80)
 
 
-# --- 클래스 정의 ---
-
-class Snake:
-    """뱀의 로직을 관리하는 클래스"""
-    def __init__(self):
-        self.reset()
-
-    def reset(self):
-        """뱀을 초기 상태로 리셋합니다."""
-        self.body = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
-        self.grow = False
-
-    def move(self):
-        """뱀을 현재 방향으로 한 칸 이동시킵니다."""
-        head_x, head_y = self.body[0]
-        dir_x, dir_y = self.direction
-        new_head = (head_x + dir_x, head_y + dir_y)
-
-        # 화면 경계를 벗어났는지 확인
-        if not (0 <= new_head[0] < GRID_WIDTH and 0 <= new_head[1] < GRID_HEIGHT):
-            return False # 게임 오버
-
-        # 머리가 몸통의 다른 부분과 충돌했는지 확인합니다.
-        if len(self.body) > 1 and new_head in self.body[1:]:
-            return False # 게임 오버
-
-        self.body.insert(0, new_head)
-
-        if self.grow:
-            self.grow = False
-        else:
-            self.body.pop()
-        
-        return True
-
-    def change_direction(self, new_direction):
-        """뱀의 이동 방향을 변경합니다. 단, 반대 방향으로는 즉시 변경할 수 없습니다."""
-        if len(self.body) > 1 and (self.direction[0] * -1, self.direction[1] * -1) == new_direction:
-            return
-        self.direction = new_direction
-
-    def grow_snake(self):
-        """뱀의 몸을 한 칸 늘립니다."""
-        self.grow = True
-
-    def draw(self, surface):
-        """뱀을 화면에 그립니다. 머리는 다른 색으로 표시합니다."""
-        for i, segment in enumerate(self.body):
-            x, y = segment
-            rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            color = COLOR_SNAKE_HEAD if i == 0 else COLOR_SNAKE
-            pygame.draw.rect(surface, color, rect)
-            pygame.draw.rect(surface, COLOR_BACKGROUND, rect, 1) # 세그먼트 테두리
-
-class Food:
-    """음식의 로직을 관리하는 클래스"""
-    def __init__(self, snake_body):
-        self.position = (0, 0)
-        self.randomize_position(snake_body)
-
-    def randomize_position(self, snake_body):
-        """음식의 위치를 뱀의 몸과 겹치지 않는 무작위 위치로 변경합니다."""
-        while True:
-            self.position = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-            if self.position not in snake_body:
-                break
-
-    def draw(self, surface):
-        """음식을 화면에 그립니다."""
-        x, y = self.position
-        rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-        pygame.draw.rect(surface, COLOR_FOOD, rect)
-        pygame.draw.rect(surface, COLOR_BACKGROUND, rect, 1) # 테두리
-
 # --- 그리기 함수 ---
 
+def draw_cell(surface, position, color):
+    """한 칸을 테두리와 함께 그리고, 그린 영역을 돌려줍니다."""
+    x, y = position
+    rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+    pygame.draw.rect(surface, color, rect)
+    pygame.draw.rect(surface, COLOR_BACKGROUND, rect, 1) # 테두리
+    return rect
+
+def draw_snake(surface, snake):
+    """뱀을 화면에 그립니다. 머리는 다른 색으로 표시합니다."""
+    for i, segment in enumerate(snake.body):
+        draw_cell(surface, segment, COLOR_SNAKE_HEAD if i == 0 else COLOR_SNAKE)
+
+def draw_food(surface, food):
+    """음식을 화면에 그립니다."""
+    if food.position is None:
+        return
+    draw_cell(surface, food.position, COLOR_FOOD)
+
 def draw_grid(surface):
     """게임 배경에 그리드를 그립니다."""
     for x in range(0, SCREEN_WIDTH, GRID_SIZE):
@@ -161,95 +119,456 @@ def draw_grid(surface):
     for y in range(0, SCREEN_HEIGHT, GRID_SIZE):
         pygame.draw.line(surface, COLOR_GRID, (0, y), (SCREEN_WIDTH, y))
 
+def get_score_text(score):
+    """점수 글자 서피스와 화면 상단의 위치를 돌려줍니다."""
+    text_surface = render_text(font_small, f"Score: {score}", COLOR_TEXT)
+    return text_surface, text_surface.get_rect(center=(SCREEN_WIDTH / 2, 25))
+
 def draw_score(surface, score):
     """화면 상단에 현재 점수를 표시합니다."""
-    score_text = f"Score: {score}"
-    text_surface = font_small.render(score_text, True, COLOR_TEXT)
-    text_rect = text_surface.get_rect(center=(SCREEN_WIDTH / 2, 25))
+    text_surface, text_rect = get_score_text(score)
     surface.blit(text_surface, text_rect)
+    return text_rect
 
 def draw_text_overlay(surface, title, subtitle):
     """화면 중앙에 반투명 오버레이와 함께 텍스트를 표시합니다."""
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-    overlay.fill(COLOR_OVERLAY)
-    surface.blit(overlay, (0, 0))
+    surface.blit(get_overlay((SCREEN_WIDTH, SCREEN_HEIGHT), COLOR_OVERLAY), (0, 0))
 
-    title_surf = font_large.render(title, True, COLOR_TEXT)
+    title_surf = render_text(font_large, title, COLOR_TEXT)
     title_rect = title_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 - 50))
     surface.blit(title_surf, title_rect)
 
-    subtitle_surf = font_small.render(subtitle, True, COLOR_TEXT)
+    subtitle_surf = render_text(font_small, subtitle, COLOR_TEXT)
     subtitle_rect = subtitle_surf.get_rect(center=(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2 + 50))
     surface.blit(subtitle_surf, subtitle_rect)
 
+# --- 렌더러 ---
+
+class Renderer:
+    """그리드를 미리 그려 둔 배경 위에, 바뀐 칸만 다시 그리는 렌더러
+
+    시뮬레이션 틱 사이의 프레임에서는 머리와 꼬리를 두 칸 사이에 보간해 부드럽게 움직입니다.
+    """
+    def __init__(self, surface):
+        self.surface = surface
+        # 그리드는 배경 서피스에 한 번만 그려 둡니다.
+        self.background = pygame.Surface(surface.get_size()).convert()
+        self.background.fill(COLOR_BACKGROUND)
+        draw_grid(self.background)
+        self.motion = None
+        self.stale = set()
+        self.last_food = None
+        self.last_score = None
+        self.score_rect = pygame.Rect(0, 0, 0, 0)
+        self.invalidate()
+
+    def invalidate(self):
+        """다음 프레임을 전체 다시 그리도록 표시합니다. (상태 전환, 창 노출 시)"""
+        self.full_redraw = True
+
+    def present(self):
+        """전체 화면을 내보냅니다."""
+        pygame.display.flip()
+        self.full_redraw = False
+
+    def reset(self):
+        """새 게임을 위해 보간 상태를 지웁니다."""
+        self.motion = None
+        self.stale.clear()
+        self.invalidate()
+
+    def draw_board(self, game):
+        """배경, 뱀, 음식, 점수를 모두 그리고 부분 갱신용 상태를 기록합니다."""
+        self.surface.blit(self.background, (0, 0))
+        draw_snake(self.surface, game.snake)
+        draw_food(self.surface, game.food)
+        self.score_rect = draw_score(self.surface, game.score)
+        self.last_food = game.food.position
+        self.last_score = game.score
+        self.stale.clear()
+
+    def on_step(self, game, old_head, old_tail):
+        """시뮬레이션 한 틱이 끝날 때마다 호출합니다. 이번 틱의 머리/꼬리 이동을 기록합니다."""
+        if self.motion is not None:
+            # 직전 틱의 이동 칸은 최종 상태로 한 번 더 그려야 합니다.
+            self.stale.update(cell for cell in self.motion if cell is not None)
+        snake = game.snake
+        head = snake.body[0]
+        if head == old_head:
+            self.motion = None # 이동하지 못함 (게임 오버)
+        else:
+            vacated = old_tail if old_tail not in snake else None
+            self.motion = (old_head, head, vacated, snake.body[-1])
+        food = game.food.position
+        if food != self.last_food:
+            self.stale.add(self.last_food)
+            self.stale.add(food)
+            self.last_food = food
+        self.stale.discard(None)
+
+    def draw_playing(self, game, alpha=1.0):
+        """플레이 화면을 그립니다. alpha(0~1)는 마지막 틱 이후 다음 틱까지 진행된 비율입니다."""
+        if self.full_redraw:
+            self.draw_board(game)
+            self.present()
+            return
+
+        cells = set(self.stale)
+        self.stale.clear()
+        if self.motion is not None:
+            cells.update(cell for cell in self.motion if cell is not None)
+        dirty = [self._paint_cell(game, cell) for cell in cells]
+
+        # 점수가 바뀌었거나, 다시 그린 칸이 점수 글자를 덮었으면 점수 영역도 갱신합니다.
+        score_dirty = game.score != self.last_score or self.score_rect.collidelist(dirty) != -1
+        if score_dirty:
+            dirty.append(self._paint_score_area(game))
+
+        if self.motion is not None:
+            old_head, head, vacated, tail = self.motion
+            if vacated is not None:
+                self._draw_between(vacated, tail, alpha, COLOR_SNAKE)
+            self._draw_between(old_head, head, alpha, COLOR_SNAKE_HEAD)
+
+        if score_dirty:
+            self.score_rect = draw_score(self.surface, game.score)
+            self.last_score = game.score
+        pygame.display.update(dirty)
+
+    def _draw_between(self, start, end, alpha, color):
+        """두 칸 사이의 보간 위치에 한 칸 크기의 사각형을 그립니다."""
+        x = start[0] + (end[0] - start[0]) * alpha
+        y = start[1] + (end[1] - start[1]) * alpha
+        rect = pygame.Rect(round(x * GRID_SIZE), round(y * GRID_SIZE), GRID_SIZE, GRID_SIZE)
+        pygame.draw.rect(self.surface, color, rect)
+        pygame.draw.rect(self.surface, COLOR_BACKGROUND, rect, 1)
+
+    def _paint_cell(self, game, cell):
+        """배경을 복원한 뒤 현재 상태에 맞게 한 칸을 다시 그립니다. 움직이는 머리는 따로 그립니다."""
+        x, y = cell
+        rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
+        self.surface.blit(self.background, rect, rect)
+        snake = game.snake
+        if cell == snake.body[0]:
+            if self.motion is None:
+                draw_cell(self.surface, cell, COLOR_SNAKE_HEAD)
+        elif cell in snake:
+            draw_cell(self.surface, cell, COLOR_SNAKE)
+        elif cell == game.food.position:
+            draw_cell(self.surface, cell, COLOR_FOOD)
+        return rect
+
+    def _paint_score_area(self, game):
+        """이전 점수 글자 아래의 칸들을 복원하고, 새 점수가 들어갈 영역을 돌려줍니다."""
+        area = self.score_rect.union(get_score_text(game.score)[1])
+        left, top = area.left // GRID_SIZE, area.top // GRID_SIZE
+        right, bottom = (area.right - 1) // GRID_SIZE, (area.bottom - 1) // GRID_SIZE
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                self._paint_cell(game, (x, y))
+        return area
+
+def present_hud():
+    """프로파일러 HUD를 그리고 그 영역만 화면에 내보냅니다. (렌더러는 바뀐 칸만 내보내므로)"""
+    rect = profiler.draw_hud(screen)
+    if rect is not None:
+        pygame.display.update(rect)
+
+# --- 소크(장시간) 테스트 ---
+SOAK_REPORT_EVERY = 500
+
+def get_rss_mb():
+    """현재 프로세스의 RSS(MB). /proc이 없으면 최대 RSS로 대신하고, 둘 다 없으면 None."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, 리눅스는 KB 단위입니다.
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+def post_soak_input(game_state, rng):
+    """소크 테스트용 자동 입력을 실제 키 이벤트로 넣어 재시작 경로를 그대로 사용합니다."""
+    if game_state == START:
+        key = pygame.K_SPACE
+    elif game_state == PLAYING:
+        if rng.random() > 0.2:
+            return
+        key = rng.choice([pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT])
+    else:
+        key = pygame.K_r
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+def report_autopilot(autopilot):
+    avg_ms, p99_ms, count = autopilot.stats()
+    print(f"자동 조종: 결정 {count}회, 평균 {avg_ms:.3f} ms, p99 {p99_ms:.3f} ms")
+
+def report_rss(label):
+    rss = get_rss_mb()
+    print(f"{label}: RSS {rss:.1f} MB" if rss is not None else f"{label}: RSS 측정 불가")
+
 # --- 메인 게임 로직 ---
 
-def game_loop():
-    """메인 게임 루프. 게임의 상태를 관리하고 화면을 업데이트합니다."""
+def next_turn(input_queue, snake):
+    """대기 중인 방향 입력 중 이번 틱에 적용할 첫 입력을 꺼냅니다. 같은 방향/반대 방향 입력은 버립니다."""
+    dir_x, dir_y = snake.direction
+    while input_queue:
+        direction = input_queue.popleft()
+        if direction == snake.direction:
+            continue
+        if len(snake.body) > 1 and direction == (-dir_x, -dir_y):
+            continue
+        return direction
+    return None
+
+def game_loop(soak_restarts=0, autopilot_on=False, record_path=None):
+    """메인 게임 루프. 게임의 상태를 관리하고 화면을 업데이트합니다.
+
+    soak_restarts가 0보다 크면 자동 입력으로 그만큼 재시작을 반복하며 메모리(RSS)를 보고한 뒤 돌아옵니다.
+    autopilot_on이면 자동 조종 데모로 시작합니다. 플레이 중 'A' 키로 켜고 끌 수 있습니다.
+    record_path를 주면 끝난 판마다 리플레이를 그 파일에 덧붙입니다.
+    """
     game_state = START
-    snake = Snake()
-    food = Food(snake.body)
-    score = 0
+    state_changed_at = pygame.time.get_ticks()
+    autopilot = Autopilot(GRID_WIDTH, GRID_HEIGHT)
+    game = SnakeGame()
+    snake = game.snake
+    replay = None
+    renderer = Renderer(screen)
     game_speed = 10
+    # 시뮬레이션은 1 / game_speed 초 간격의 고정 틱으로 돌고, 화면과 입력은 RENDER_FPS로 갱신합니다.
+    accumulator = 0.0
+    input_queue = deque()
+    restarts = 0
+    soak_rng = random.Random(0)
+    if soak_restarts:
+        report_rss("소크 테스트 시작")
 
     while True:
+        profiler.begin_frame()
+        if soak_restarts:
+            post_soak_input(game_state, soak_rng)
+        elif autopilot_on and game_state != PLAYING and pygame.time.get_ticks() - state_changed_at > ATTRACT_DELAY_MS:
+            # 데모 모드에서는 시작/재시작 키를 대신 눌러 줍니다.
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE if game_state == START else pygame.K_r))
+
         # --- 이벤트 처리 ---
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                renderer.invalidate()
             
             # 게임 상태에 따른 키 입력 처리
             if game_state == START:
                 if event.type == pygame.KEYDOWN:
+                    # 판마다 새 시드로 기존 객체를 리셋하고, 리플레이 기록을 시작합니다.
+                    seed = random.getrandbits(64)
+                    game.reset(seed)
+                    autopilot.reset()
+                    replay = Replay.for_game(game, seed)
                     game_state = PLAYING
+                    accumulator = 1.0 / game_speed # 첫 틱은 바로 진행합니다.
+                    renderer.invalidate()
             elif game_state == PLAYING:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_UP: snake.change_direction(UP)
-                    elif event.key == pygame.K_DOWN: snake.change_direction(DOWN)
-                    elif event.key == pygame.K_LEFT: snake.change_direction(LEFT)
-                    elif event.key == pygame.K_RIGHT: snake.change_direction(RIGHT)
-            elif game_state == GAME_OVER:
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_a:
+                    # 게임 도중에 켜면 몸통이 순환 위에 정렬될 때까지는 충돌할 수도 있습니다.
+                    autopilot_on = not autopilot_on
+                    input_queue.clear()
+                elif event.type == pygame.KEYDOWN and event.key in DIRECTION_KEYS:
+                    # 빠르게 연달아 누른 입력도 틱마다 하나씩 순서대로 적용합니다.
+                    if len(input_queue) < INPUT_QUEUE_SIZE:
+                        input_queue.append(DIRECTION_KEYS[event.key])
+            elif game_state in (GAME_OVER, CLEARED):
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
-                        game_loop() # 게임 재시작
+                        # 게임 재시작: 재귀 호출 대신 상태만 되돌리고, 시작할 때 기존 객체를 리셋합니다.
+                        game_speed = 10
+                        game_state = START
+                        state_changed_at = pygame.time.get_ticks()
+                        input_queue.clear()
+                        renderer.reset()
+                        restarts += 1
+                        if soak_restarts:
+                            if restarts % SOAK_REPORT_EVERY == 0:
+                                report_rss(f"재시작 {restarts}회")
+                            if restarts >= soak_restarts:
+                                return
                     elif event.key == pygame.K_q:
                         pygame.quit()
                         sys.exit()
+        profiler.mark("input")
+
+        # --- 시뮬레이션 ---
+        if game_state == PLAYING:
+            steps = 0
+            while accumulator >= 1.0 / game_speed:
+                if steps == MAX_STEPS_PER_FRAME:
+                    accumulator = 0.0 # 너무 밀렸으면 따라잡기를 포기합니다.
+                    break
+                accumulator -= 1.0 / game_speed
+                steps += 1
+                old_head, old_tail = snake.body[0], snake.body[-1]
+                if autopilot_on:
+                    action = autopilot.decide(snake, game.food.position)
+                else:
+                    action = next_turn(input_queue, snake)
+                replay.record(action)
+                _, reward, done = game.step(action)
+                renderer.on_step(game, old_head, old_tail)
+                if done:
+                    replay.finish(game)
+                    if record_path:
+                        append_replay(record_path, replay)
+                    game_state = CLEARED if game.cleared else GAME_OVER
+                    state_changed_at = pygame.time.get_ticks()
+                    renderer.invalidate()
+                    if autopilot_on:
+                        report_autopilot(autopilot)
+                    break
+                if reward > 0 and game_speed < 30:
+                    game_speed += 0.5
+        profiler.mark("update") # 충돌 판정은 game.step 안에서 합니다.
 
         # --- 화면 그리기 ---
-        screen.fill(COLOR_BACKGROUND)
-        
         if game_state == START:
-            draw_text_overlay(screen, "스네이크 게임", "아무 키나 눌러 시작하세요")
+            if renderer.full_redraw:
+                screen.fill(COLOR_BACKGROUND)
+                draw_text_overlay(screen, "스네이크 게임", "아무 키나 눌러 시작하세요")
+                renderer.present()
         
         elif game_state == PLAYING:
-            draw_grid(screen)
-            
-            if not snake.move():
-                game_state = GAME_OVER
-
-            if snake.body[0] == food.position:
-                snake.grow_snake()
-                food.randomize_position(snake.body)
-                score += 1
-                if game_speed < 30: game_speed += 0.5
-
-            snake.draw(screen)
-            food.draw(screen)
-            draw_score(screen, score)
-
-        elif game_state == GAME_OVER:
-            # 게임 오버 시 마지막 게임 화면을 보여줍니다.
-            draw_grid(screen)
-            snake.draw(screen)
-            food.draw(screen)
-            draw_score(screen, score)
-            draw_text_overlay(screen, "게임 종료", f"점수: {score} | 'R' 키를 눌러 재시작, 'Q' 키를 눌러 종료")
+            renderer.draw_playing(game, min(accumulator * game_speed, 1.0))
+
+        elif game_state in (GAME_OVER, CLEARED):
+            # 게임 오버 시 마지막 게임 화면을 보여줍니다. 화면이 바뀌지 않으므로 한 번만 그립니다.
+            if renderer.full_redraw:
+                renderer.draw_board(game)
+                title = "보드 클리어!" if game_state == CLEARED else "게임 종료"
+                draw_text_overlay(screen, title, f"점수: {game.score} | 'R' 키를 눌러 재시작, 'Q' 키를 눌러 종료")
+                renderer.present()
+        # 렌더러가 바뀐 영역을 직접 화면에 내보내므로, 여기까지가 그리기 단계입니다. HUD는 그 위에 따로 내보냅니다.
+        profiler.mark("draw")
+        present_hud()
+        profiler.mark("flip")
 
         # --- 화면 업데이트 ---
-        pygame.display.flip()
-        clock.tick(game_speed)
+        if soak_restarts:
+            # 소크 테스트는 프레임 제한 없이, 프레임마다 한 틱씩 진행합니다.
+            clock.tick(0)
+            frame_time = 1.0 / game_speed
+        else:
+            frame_time = clock.tick(RENDER_FPS) / 1000
+        if game_state == PLAYING:
+            accumulator += frame_time
+        profiler.mark("wait")
+
+# --- 아레나 모드 ---
+
+def arena_colors(num_snakes):
+    """뱀 번호 + 1로 찾는 색 목록. 0번(사람)은 기본 뱀 색, 봇은 색상환을 나눠 씁니다."""
+    colors = [COLOR_BACKGROUND, COLOR_SNAKE_HEAD]
+    for i in range(1, num_snakes):
+        color = pygame.Color(0)
+        color.hsva = (i * 360 / num_snakes % 360, 60, 85, 100)
+        colors.append(color)
+    return colors
+
+def arena_loop(num_snakes=ARENA_SNAKES):
+    """사람 한 명과 봇 num_snakes - 1마리가 한 보드에서 겨루는 아레나 모드.
+
+    보드 서피스에는 틱마다 바뀐 칸만 다시 칠하므로, 그리기 비용도 뱀 수에만 비례합니다.
+    """
+    width, height = SCREEN_WIDTH // ARENA_CELL_SIZE, SCREEN_HEIGHT // ARENA_CELL_SIZE
+    colors = arena_colors(num_snakes)
+    board = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    input_queue = deque()
+
+    while True:
+        arena = Arena(width, height, num_snakes, players=1)
+        player = arena.snakes[0]
+        paint_arena_cells(board, arena, range(arena.size), colors)
+        input_queue.clear()
+        accumulator = 0.0
+        restart = False
+
+        while not restart:
+            profiler.begin_frame()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                if event.type != pygame.KEYDOWN:
+                    continue
+                if player.alive:
+                    if event.key in DIRECTION_KEYS and len(input_queue) < INPUT_QUEUE_SIZE:
+                        input_queue.append(DIRECTION_KEYS[event.key])
+                elif event.key == pygame.K_r:
+                    restart = True
+                elif event.key == pygame.K_q:
+                    pygame.quit()
+                    sys.exit()
+            profiler.mark("input")
+
+            steps = 0
+            while player.alive and accumulator >= 1.0 / ARENA_SPEED and steps < MAX_STEPS_PER_FRAME:
+                accumulator -= 1.0 / ARENA_SPEED
+                steps += 1
+                actions = arena.bot_actions()
+                actions[0] = next_turn(input_queue, player)
+                arena.step(actions)
+                paint_arena_cells(board, arena, arena.changed, colors)
+            if steps == MAX_STEPS_PER_FRAME:
+                accumulator = 0.0 # 너무 밀렸으면 따라잡기를 포기합니다.
+            profiler.mark("update")
+
+            screen.blit(board, (0, 0))
+            alive = sum(1 for snake in arena.snakes if snake.alive)
+            screen.blit(render_text(font_small, f"Score: {player.score}  뱀: {alive}", COLOR_TEXT), (10, 10))
+            if not player.alive:
+                draw_text_overlay(screen, "게임 종료", f"점수: {player.score} | 'R' 키를 눌러 재시작, 'Q' 키를 눌러 종료")
+            profiler.draw_hud(screen)
+            profiler.mark("draw")
+            pygame.display.flip()
+            profiler.mark("flip")
+            accumulator += clock.tick(RENDER_FPS) / 1000
+            profiler.mark("wait")
+
+def paint_arena_cells(surface, arena, cells, colors):
+    """격자 값에 따라 칸을 칠합니다."""
+    width, grid = arena.width, arena.grid
+    for cell in cells:
+        value = grid[cell]
+        rect = ((cell % width) * ARENA_CELL_SIZE, (cell // width) * ARENA_CELL_SIZE, ARENA_CELL_SIZE, ARENA_CELL_SIZE)
+        if value == EMPTY:
+            surface.fill(COLOR_BACKGROUND, rect)
+        elif value == FOOD:
+            surface.fill(COLOR_FOOD, rect)
+        else:
+            surface.fill(colors[value], rect)
 
 if __name__ == "__main__":
-    game_loop()
+    # 사용법: python "스네이크 2.0.py" [--soak [재시작 횟수]] [--autopilot] [--record 리플레이파일] [--arena [뱀 수]]
+    #   [--profile [기록파일.csv|.json]]
+    record_path = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv else None
+    if "--arena" in sys.argv:
+        index = sys.argv.index("--arena")
+        num_snakes = int(sys.argv[index + 1]) if len(sys.argv) > index + 1 and sys.argv[index + 1].isdigit() else ARENA_SNAKES
+        if num_snakes < 1:
+            print("--arena의 뱀 수는 1 이상이어야 합니다. (첫 뱀은 사람이 조종합니다)")
+            sys.exit(1)
+        arena_loop(num_snakes)
+    elif "--soak" in sys.argv:
+        index = sys.argv.index("--soak")
+        count = int(sys.argv[index + 1]) if len(sys.argv) > index + 1 and sys.argv[index + 1].isdigit() else 5000
+        game_loop(soak_restarts=count, record_path=record_path)
+        pygame.quit()
+    else:
+        game_loop(autopilot_on="--autopilot" in sys.argv, record_path=record_path)
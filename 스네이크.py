@@ -2,10 +2,16 @@ import pygame
 import sys
 import random
 
+from frame_profiler import profiler_from_args
+from render_cache import render_text
+from snake_core import UP, DOWN, LEFT, RIGHT, SnakeGame
+from snake_replay import Replay, append_replay
+
 # 게임 설정
 CELL_SIZE = 20
-GRID_WIDTH = 30
+GRID_WIDTH = 30 # 화면(뷰포트) 크기. 기본 월드도 이 크기입니다.
 GRID_HEIGHT = 20
+MAX_WORLD_SIZE = 2000
 WIDTH = GRID_WIDTH * CELL_SIZE
 HEIGHT = GRID_HEIGHT * CELL_SIZE
 FPS = 10
@@ -21,67 +27,108 @@ def draw_rect(screen, color, position):
     rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE)
     pygame.draw.rect(screen, color, rect)
 
-def main():
+def draw_view(screen, game, camera_x, camera_y, view_width, view_height):
+    """카메라에서 보이는 칸만 그립니다. 월드 크기나 뱀 길이와 상관없이 화면 칸 수만큼만 확인합니다."""
+    world_width, world_height = game.width, game.height
+    occupied = game.snake.occupied
+    for row in range(view_height):
+        base = ((camera_y + row) % world_height) * world_width
+        for col in range(view_width):
+            if occupied[base + (camera_x + col) % world_width]:
+                draw_rect(screen, GREEN, (col, row))
+
+    # 음식은 화면 안이면 그 칸에, 밖이면 가장 가까운 방향의 화면 가장자리에 표시합니다.
+    food_x, food_y = game.food.position
+    col = (food_x - camera_x) % world_width
+    row = (food_y - camera_y) % world_height
+    if col < view_width and row < view_height:
+        draw_rect(screen, RED, (col, row))
+    else:
+        if col >= view_width:
+            col = view_width - 1 if col - view_width < world_width - col else 0
+        if row >= view_height:
+            row = view_height - 1 if row - view_height < world_height - row else 0
+        center = (col * CELL_SIZE + CELL_SIZE // 2, row * CELL_SIZE + CELL_SIZE // 2)
+        pygame.draw.circle(screen, RED, center, CELL_SIZE // 4)
+
+def follow_camera(game, view_width, view_height):
+    """머리가 화면 가운데 오도록 카메라(화면 왼쪽 위 칸)를 정합니다. 월드가 화면보다 작으면 고정합니다."""
+    head_x, head_y = game.snake.body[0]
+    camera_x = (head_x - view_width // 2) % game.width if game.width > view_width else 0
+    camera_y = (head_y - view_height // 2) % game.height if game.height > view_height else 0
+    return camera_x, camera_y
+
+KEY_DIRECTIONS = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
+
+def main(record_path=None, world_width=GRID_WIDTH, world_height=GRID_HEIGHT):
+    """record_path를 주면 이번 판의 리플레이를 그 파일에 덧붙입니다. (중간에 닫아도 기록합니다)
+
+    월드가 화면보다 크면 카메라가 머리를 따라가며 보이는 부분만 그립니다.
+    """
+    if not (1 <= world_width <= MAX_WORLD_SIZE and 1 <= world_height <= MAX_WORLD_SIZE):
+        raise ValueError(f"월드 크기는 1~{MAX_WORLD_SIZE} 칸이어야 합니다.")
+    view_width = min(world_width, GRID_WIDTH)
+    view_height = min(world_height, GRID_HEIGHT)
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Snake Game")
     clock = pygame.time.Clock()
     font = pygame.font.SysFont(None, 36)
 
-    snake = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
-    direction = (1, 0)
-    food = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-    score = 0
+    # 규칙은 스네이크 2.0과 같은 엔진을 쓰되, 이 버전은 경계를 통과하고 오른쪽을 보고 시작합니다.
+    # 월드 상태는 엔진의 점유 비트맵(칸당 1바이트)으로만 읽어 그립니다.
+    seed = random.getrandbits(64)
+    game = SnakeGame(world_width, world_height, seed=seed, wrap=True, start_direction=RIGHT)
+    replay = Replay.for_game(game, seed)
+    profiler = profiler_from_args("스네이크")
     running = True
     fps = FPS
     while running:
+        profiler.begin_frame()
         clock.tick(fps)
+        profiler.mark("wait")
+        action = None
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP and direction != (0, 1):
-                    direction = (0, -1)
-                elif event.key == pygame.K_DOWN and direction != (0, -1):
-                    direction = (0, 1)
-                elif event.key == pygame.K_LEFT and direction != (1, 0):
-                    direction = (-1, 0)
-                elif event.key == pygame.K_RIGHT and direction != (-1, 0):
-                    direction = (1, 0)
-
-        head_x, head_y = snake[0]
-        dx, dy = direction
-        new_head = ((head_x + dx) % GRID_WIDTH, (head_y + dy) % GRID_HEIGHT)
-
-        if new_head in snake:
+            elif event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS:
+                # 한 프레임에 여러 키를 누르면 마지막 키만 적용합니다.
+                action = KEY_DIRECTIONS[event.key]
+        profiler.mark("input")
+        if not running:
+            break
+
+        replay.record(action)
+        _, reward, done = game.step(action)
+        if done:
             running = False
             continue
-
-        snake.insert(0, new_head)
-
-        if new_head == food:
-            score += 1
-            while True:
-                food = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
-                if food not in snake:
-                    break
+        if reward > 0:
             fps += 0.3
-        else:
-            snake.pop()
+        profiler.mark("update")
 
         screen.fill(BLACK)
-        for segment in snake:
-            draw_rect(screen, GREEN, segment)
-        draw_rect(screen, RED, food)
+        camera_x, camera_y = follow_camera(game, view_width, view_height)
+        draw_view(screen, game, camera_x, camera_y, view_width, view_height)
 
-        score_surface = font.render(f"Score: {score}", True, WHITE)
+        score_surface = render_text(font, f"Score: {game.score}", WHITE)
         screen.blit(score_surface, (10, 10))
+        profiler.draw_hud(screen)
+        profiler.mark("draw")
 
         pygame.display.flip()
+        profiler.mark("flip")
+
+    replay.finish(game)
+    if record_path:
+        append_replay(record_path, replay)
 
     # 게임 오버 화면
     screen.fill(BLACK)
-    msg = font.render("Game Over! Press any key to exit.", True, WHITE)
+    if game.cleared:
+        msg = render_text(font, "Board Cleared! Press any key to exit.", WHITE)
+    else:
+        msg = render_text(font, "Game Over! Press any key to exit.", WHITE)
     msg_rect = msg.get_rect(center=(WIDTH // 2, HEIGHT // 2))
     screen.blit(msg, msg_rect)
     pygame.display.flip()
@@ -96,4 +143,10 @@ def main():
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # 사용법: python 스네이크.py [--world 가로x세로] [--record 리플레이파일] [--profile [기록파일.csv|.json]]
+    #   예) python 스네이크.py --world 2000x2000
+    record_path = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv else None
+    world_width, world_height = GRID_WIDTH, GRID_HEIGHT
+    if "--world" in sys.argv:
+        world_width, world_height = map(int, sys.argv[sys.argv.index("--world") + 1].lower().split("x"))
+    main(record_path, world_width, world_height)
\ No newline at end of file
@@ -2,6 +2,9 @@ import pygame
 import sys
 import random
 
+from frame_profiler import profiler_from_args
+from render_cache import render_text
+
 # --- 초기화 ---
 pygame.init()
 
@@ -14,6 +17,7 @@ pygame.display.set_caption("점프킹")
 # --- 시계 설정 ---
 clock = pygame.time.Clock()
 FPS = 60
+profiler = profiler_from_args("점프킹") # --profile [파일] 또는 GAME_PROFILE=1 로 프레임 단계별 시간 표시
 
 # --- 색상 및 폰트 정의 ---
 BACKGROUND_COLOR = (44, 62, 80)
@@ -61,7 +65,9 @@ reset_game()
 # --- 게임 루프 ---
 running = True
 while running:
+    profiler.begin_frame()
     clock.tick(FPS)
+    profiler.mark("wait")
     
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
@@ -79,16 +85,18 @@ while running:
             if event.type == pygame.MOUSEBUTTONDOWN:
                 reset_game()
                 game_state = 'playing'
+    profiler.mark("input")
         
     screen.fill(BACKGROUND_COLOR)
 
     if game_state == 'start':
-        title_text = TITLE_FONT.render("점프킹", True, TEXT_COLOR)
-        start_text = small_font.render("마우스 버튼을 눌러 시작", True, TEXT_COLOR)
+        title_text = render_text(TITLE_FONT, "점프킹", TEXT_COLOR)
+        start_text = render_text(small_font, "마우스 버튼을 눌러 시작", TEXT_COLOR)
         screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 3))
         screen.blit(start_text, (SCREEN_WIDTH // 2 - start_text.get_width() // 2, SCREEN_HEIGHT // 2))
 
     elif game_state == 'playing':
+        profiler.mark("draw")
         keys = pygame.key.get_pressed()
         if keys[pygame.K_LEFT]: player_x -= PLAYER_HORIZONTAL_SPEED
         if keys[pygame.K_RIGHT]: player_x += PLAYER_HORIZONTAL_SPEED
@@ -109,6 +117,7 @@ while running:
             for plat in platforms: plat.y += scroll_speed
 
         player_rect = pygame.Rect(player_x - 15, player_y - 15, 30, 30)
+        profiler.mark("update")
 
         if player_vy > 0:
             for plat in platforms:
@@ -116,6 +125,7 @@ while running:
                     player_vy = JUMP_STRENGTH
                     player_y = plat.top - 15
                     jump_effect_timer = 10
+        profiler.mark("collision")
         
         platforms[:] = [p for p in platforms if p.top <= SCREEN_HEIGHT]
         while len(platforms) < 10:
@@ -126,6 +136,7 @@ while running:
 
         if player_y > SCREEN_HEIGHT:
             game_state = 'game_over'
+        profiler.mark("update")
 
         for plat in platforms:
             pygame.draw.rect(screen, PLATFORM_COLOR, plat, border_radius=10)
@@ -136,19 +147,22 @@ while running:
             jump_effect_timer -= 1
         pygame.draw.circle(screen, current_player_color, (int(player_x), int(player_y)), 15)
         
-        score_text = small_font.render(f"Score: {score}", True, TEXT_COLOR)
+        score_text = render_text(small_font, f"Score: {score}", TEXT_COLOR)
         screen.blit(score_text, (10, 10))
 
     elif game_state == 'game_over':
-        over_text = font.render("게임 오버", True, TEXT_COLOR)
-        score_text = small_font.render(f"최종 점수: {score}", True, TEXT_COLOR)
-        restart_text = small_font.render("마우스 버튼을 눌러 재시작", True, TEXT_COLOR)
+        over_text = render_text(font, "게임 오버", TEXT_COLOR)
+        score_text = render_text(small_font, f"최종 점수: {score}", TEXT_COLOR)
+        restart_text = render_text(small_font, "마우스 버튼을 눌러 재시작", TEXT_COLOR)
 
         screen.blit(over_text, (SCREEN_WIDTH // 2 - over_text.get_width() // 2, SCREEN_HEIGHT // 3))
         screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2))
         screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
 
+    profiler.draw_hud(screen)
+    profiler.mark("draw")
     pygame.display.flip()
+    profiler.mark("flip")
 
 pygame.quit()
 sys.exit()
@@ -1,27 +1,60 @@
 import pygame
 import sys
 import math
-import random
+import time
+
+from frame_profiler import profiler_from_args
+from render_cache import SurfaceCache, render_text, get_prebuilt
+from pacman_core import (FPS, MAZE_TOP_OFFSET, GRID_SIZE, PELLET, POWER_PELLET, GAME_OVER, WIN,
+                         DEFAULT_GHOSTS, DEFAULT_MAZE, DIRECTIONS, GameState, Maze)
+from pacman_level import OPEN, WALL, GATE, generate_level, load_level_pack
 
 # --- 초기화 ---
 pygame.init()
 
+# --- 레벨 ---
+# 사용법: python "팩맨 2.0.py" [--ghosts 고스트 수] [--level 레벨팩 파일] [--speed 배속|max] [--profile [기록파일.csv|.json]]
+#        python "팩맨 2.0.py" --mega [가로x세로] [--seed S] [--ghosts 고스트 수]
+#   레벨 팩을 주면 이길 때마다 다음 레벨로 넘어갑니다.
+#   --mega는 무작위로 만든 큰 미로(기본 500x500)를 카메라로 따라가며 보이는 부분만 그립니다.
+#   게임 중 1/2/3/4 키로 1배속, 4배속, 100배속, 최대 속도(제한 없음)를 고릅니다.
+MEGA = "--mega" in sys.argv
+MEGA_SIZE = 500
+MEGA_GHOSTS = 2000
+MEGA_FIELD_RADIUS = 40 # 큰 미로에서는 추격/흩어지기 거리장을 이 거리(칸)까지만 구합니다.
+MEGA_SCREEN = (960, 720)
+
+def option_after(flag):
+    """flag 바로 뒤의 값. 없거나 다른 옵션이면 None."""
+    index = sys.argv.index(flag)
+    return sys.argv[index + 1] if len(sys.argv) > index + 1 and not sys.argv[index + 1].startswith("--") else None
+
+if MEGA:
+    size = option_after("--mega")
+    mega_width, mega_height = map(int, size.lower().split("x")) if size else (MEGA_SIZE, MEGA_SIZE)
+    seed = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv else 0
+    levels = [generate_level(mega_width, mega_height, seed)]
+elif "--level" in sys.argv:
+    levels = load_level_pack(sys.argv[sys.argv.index("--level") + 1])
+else:
+    levels = [DEFAULT_MAZE.level]
+GHOST_COUNT = int(sys.argv[sys.argv.index("--ghosts") + 1]) if "--ghosts" in sys.argv else (MEGA_GHOSTS if MEGA else DEFAULT_GHOSTS)
+mazes = {}
+
 # --- 상수 ---
-SCREEN_WIDTH = 600
-SCREEN_HEIGHT = 520
-FPS = 60
-MAZE_TOP_OFFSET = 50
-GRID_SIZE = 30
-PLAYER_SPEED = 2.5
-GHOST_SPEED = 2
-GHOST_FRIGHTENED_SPEED = 1.5
-FRIGHTENED_DURATION = 7 * FPS # 7 seconds
+# 기본 크기보다 큰 레벨이 있으면 창을 그만큼 키웁니다. 큰 미로는 고정 크기 창에서 스크롤합니다.
+if MEGA:
+    SCREEN_WIDTH, SCREEN_HEIGHT = MEGA_SCREEN
+else:
+    SCREEN_WIDTH = max([600] + [level.width * GRID_SIZE for level in levels])
+    SCREEN_HEIGHT = max([520] + [level.height * GRID_SIZE + MAZE_TOP_OFFSET for level in levels])
 
 # 색상
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 YELLOW = (255, 255, 0)
 BLUE = (25, 25, 166)
+GATE_COLOR = (255, 184, 222)
 PELLET_COLOR = (255, 204, 153)
 RED = (255, 0, 0)
 PINK = (255, 184, 222)
@@ -29,311 +62,358 @@ CYAN = (0, 255, 255)
 ORANGE = (255, 184, 82)
 FRIGHTENED_COLOR = (50, 50, 255)
 FRIGHTENED_FLASH_COLOR = (200, 200, 255)
+GHOST_COLORS = [RED, PINK, CYAN, ORANGE]
 
 # --- 화면 설정 ---
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("팩맨")
 clock = pygame.time.Clock()
+profiler = profiler_from_args("팩맨 2.0")
 font = pygame.font.SysFont("malgun gothic", 28)
 big_font = pygame.font.SysFont("malgun gothic", 56)
 
-# --- 미로 데이터 ---
-original_maze = [
-    "WWWWWWWWWWWWWWWWWWWW",
-    "WP........W........PW",
-    "W.WW.WWW.WW.WWW.WW.W",
-    "W.WW.WWW.WW.WWW.WW.W",
-    "W..................W",
-    "W.WW.W.WWWWWW.W.WW.W",
-    "W....W...WW...W....W",
-    "WWWW.WWWW..WWWW.WWWW",
-    "   W.W G G  W.W   ",
-    "WWWW.W.WWWWWW.W.WWWW",
-    "W......W....W......W",
-    "W.WWWW.W.WW.W.WWWW.W",
-    "WP.................PW",
-    "WWWWWWWWWWWWWWWWWWWW",
-]
-maze = original_maze.copy()
-
-# --- 공통 유틸리티 함수 ---
-def get_grid_pos(pos):
-    return int(pos.x / GRID_SIZE), int((pos.y - MAZE_TOP_OFFSET) / GRID_SIZE)
-
-def is_wall(grid_pos):
-    x, y = grid_pos
-    if 0 <= y < len(maze) and 0 <= x < len(maze[0]):
-        return maze[y][x] == 'W'
-    return True
-
-# --- 플레이어 클래스 ---
-class Player:
-    def __init__(self, x, y):
-        self.start_pos = pygame.Vector2(x, y)
-        self.pos = pygame.Vector2(x, y)
-        self.radius = GRID_SIZE // 2 - 2
-        self.speed = PLAYER_SPEED
-        self.direction = pygame.Vector2(0, 0)
-        self.next_direction = pygame.Vector2(0, 0)
-        self.rect = pygame.Rect(self.pos.x - self.radius, self.pos.y - self.radius, self.radius * 2, self.radius*2)
-        self.mouth_angle = 0
-        self.mouth_open = True
-
-    def reset(self):
-        self.pos = pygame.Vector2(self.start_pos.x, self.start_pos.y)
-        self.direction = pygame.Vector2(0, 0)
-        self.next_direction = pygame.Vector2(0, 0)
-
-    def draw(self, screen):
-        self.rect.center = self.pos
-        
-        # Animate mouth
-        self.mouth_angle = (math.sin(pygame.time.get_ticks() * 0.02) + 1) / 2 * 45 
-        
-        # Rotate Pac-Man to face direction
-        angle = self.direction.angle_to(pygame.Vector2(1, 0))
-        
-        start_angle = math.radians(angle + self.mouth_angle)
-        end_angle = math.radians(angle - self.mouth_angle + 360)
-
-        if self.direction == (0,0): # Not moving, close mouth
-            pygame.draw.circle(screen, YELLOW, (int(self.pos.x), int(self.pos.y)), self.radius)
+# 게임 규칙과 상태는 pacman_core.GameState에 있고, 이 파일은 입력과 그리기만 맡습니다.
+
+# --- 플레이어/고스트 스프라이트 아틀라스 ---
+# 입 모양 프레임과 고스트 색/눈동자 방향 조합을 시작할 때 한 번만 그려 두고, 프레임마다 한 번씩 blit합니다.
+MOUTH_FRAMES = 8 # 입을 다문 상태(0도)부터 가장 벌린 상태(45도)까지
+MAX_MOUTH_ANGLE = 45
+FLASH_PERIOD_MS = 200
+FLASH_TIME = 2 # 겁먹은 시간이 이만큼(초) 남으면 깜빡입니다.
+
+def build_player_frames(radius):
+    """{방향: [입 프레임...]}. 멈춘 상태(0, 0)는 입을 다문 원 한 장입니다."""
+    frames = {}
+    rect = pygame.Rect(0, 0, radius * 2, radius * 2)
+    for direction in DIRECTIONS:
+        angle = direction.angle_to(pygame.Vector2(1, 0))
+        frames[(int(direction.x), int(direction.y))] = row = []
+        for i in range(MOUTH_FRAMES):
+            mouth_angle = MAX_MOUTH_ANGLE * i / (MOUTH_FRAMES - 1)
+            frame = pygame.Surface(rect.size, pygame.SRCALPHA)
+            pygame.draw.arc(frame, YELLOW, rect, math.radians(angle + mouth_angle),
+                            math.radians(angle - mouth_angle + 360), radius)
+            row.append(frame.convert_alpha())
+    closed = pygame.Surface(rect.size, pygame.SRCALPHA)
+    pygame.draw.circle(closed, YELLOW, (radius, radius), radius)
+    frames[(0, 0)] = [closed.convert_alpha()]
+    return frames
+
+def build_ghost_frame(radius, color, direction):
+    """몸통 원 + 치마 사각형 + 눈 + 눈동자. 스프라이트 원점은 고스트 중심에서 (-radius, -radius)입니다."""
+    frame = pygame.Surface((radius * 2 + 1, radius * 5 // 2 + 1), pygame.SRCALPHA)
+    pygame.draw.circle(frame, color, (radius, radius), radius)
+    pygame.draw.rect(frame, color, (0, radius / 2, radius * 2, radius * 2))
+    eye_y = radius - radius / 4
+    eye_radius = radius / 4
+    pupil_offset = direction * eye_radius * 0.6
+    for eye_x in (radius - radius / 2.5, radius + radius / 2.5):
+        pygame.draw.circle(frame, WHITE, (int(eye_x), int(eye_y)), int(eye_radius))
+        pygame.draw.circle(frame, BLACK, (int(eye_x + pupil_offset.x), int(eye_y + pupil_offset.y)), int(eye_radius / 2))
+    return frame.convert_alpha()
+
+def build_ghost_frames(radius):
+    """{(색, 방향): 프레임}. 평소 색 네 가지와 겁먹은 색/깜빡이는 색을 모두 담습니다."""
+    return {(color, (int(d.x), int(d.y))): build_ghost_frame(radius, color, d)
+            for color in GHOST_COLORS + [FRIGHTENED_COLOR, FRIGHTENED_FLASH_COLOR]
+            for d in DIRECTIONS}
+
+ACTOR_RADIUS = GRID_SIZE // 2 - 2 # pacman_core의 Player/Ghost.radius와 같습니다.
+player_frames = build_player_frames(ACTOR_RADIUS)
+ghost_frames = build_ghost_frames(ACTOR_RADIUS)
+
+# offset은 카메라 위치입니다. 화면 좌표 = 게임 좌표 - offset
+def draw_player(screen, player, offset=(0, 0)):
+    row = player_frames[(int(player.direction.x), int(player.direction.y))]
+    mouth_angle = (math.sin(pygame.time.get_ticks() * 0.02) + 1) / 2 * MAX_MOUTH_ANGLE
+    frame = row[int(mouth_angle / MAX_MOUTH_ANGLE * (len(row) - 1) + 0.5)]
+    screen.blit(frame, (int(player.pos.x) - player.radius - offset[0], int(player.pos.y) - player.radius - offset[1]))
+
+def draw_ghost(screen, ghost, frightened_timer, offset=(0, 0)):
+    color = GHOST_COLORS[ghost.index % len(GHOST_COLORS)]
+    if ghost.state == "FRIGHTENED":
+        if frightened_timer < FLASH_TIME * FPS: # 마지막 2초 동안 깜빡입니다.
+            color = FRIGHTENED_FLASH_COLOR if (pygame.time.get_ticks() // FLASH_PERIOD_MS) % 2 == 0 else FRIGHTENED_COLOR
         else:
-            pygame.draw.arc(screen, YELLOW, self.rect, start_angle, end_angle, self.radius)
-
-
-    def update(self):
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT]: self.next_direction = pygame.Vector2(-1, 0)
-        elif keys[pygame.K_RIGHT]: self.next_direction = pygame.Vector2(1, 0)
-        elif keys[pygame.K_UP]: self.next_direction = pygame.Vector2(0, -1)
-        elif keys[pygame.K_DOWN]: self.next_direction = pygame.Vector2(0, 1)
-
-    def can_move(self, pos, direction):
-        check_pos = pos + direction * GRID_SIZE
-        grid_x, grid_y = get_grid_pos(check_pos)
-        return not is_wall((grid_x, grid_y))
-
-    def move(self):
-        is_on_grid_x = abs(self.pos.x % GRID_SIZE - (GRID_SIZE / 2)) < self.speed
-        is_on_grid_y = abs((self.pos.y - MAZE_TOP_OFFSET) % GRID_SIZE - (GRID_SIZE / 2)) < self.speed
-
-        if is_on_grid_x and is_on_grid_y:
-            current_grid_pos_pixels = pygame.Vector2(
-                (int(self.pos.x / GRID_SIZE) * GRID_SIZE) + GRID_SIZE / 2,
-                (int((self.pos.y - MAZE_TOP_OFFSET)/ GRID_SIZE) * GRID_SIZE) + GRID_SIZE / 2 + MAZE_TOP_OFFSET)
-            if self.next_direction != (0,0) and self.can_move(current_grid_pos_pixels, self.next_direction):
-                self.pos = current_grid_pos_pixels
-                self.direction = self.next_direction
-                self.next_direction = pygame.Vector2(0,0)
-            elif not self.can_move(current_grid_pos_pixels, self.direction):
-                self.pos = current_grid_pos_pixels
-                self.direction = pygame.Vector2(0,0) # Stop
-        
-        if self.direction != (0,0):
-             self.pos += self.direction * self.speed
-
-# --- 고스트 클래스 ---
-class Ghost:
-    def __init__(self, x, y, color):
-        self.start_pos = pygame.Vector2(x, y)
-        self.pos = pygame.Vector2(x, y)
-        self.radius = GRID_SIZE // 2 - 2
-        self.color = color
-        self.direction = random.choice([pygame.Vector2(1,0), pygame.Vector2(-1,0), pygame.Vector2(0,1), pygame.Vector2(0,-1)])
-        self.rect = pygame.Rect(self.pos.x - self.radius, self.pos.y - self.radius, self.radius * 2, self.radius*2)
-        self.state = "CHASE" # CHASE, FRIGHTENED
-        self.speed = GHOST_SPEED
-
-    def reset(self):
-        self.pos = pygame.Vector2(self.start_pos.x, self.start_pos.y)
-        self.direction = random.choice([pygame.Vector2(1,0), pygame.Vector2(-1,0), pygame.Vector2(0,1), pygame.Vector2(0,-1)])
-        self.state = "CHASE"
-        self.speed = GHOST_SPEED
-
-    def draw(self, screen):
-        self.rect.center = self.pos
-        body_rect = pygame.Rect(self.pos.x - self.radius, self.pos.y - self.radius/2, self.radius*2, self.radius*2)
-        
-        current_color = self.color
-        if self.state == "FRIGHTENED":
-            if frightened_mode_timer < 2 * FPS: # Flash for last 2 seconds
-                current_color = FRIGHTENED_FLASH_COLOR if (pygame.time.get_ticks() // 200) % 2 == 0 else FRIGHTENED_COLOR
-            else:
-                current_color = FRIGHTENED_COLOR
-
-        pygame.draw.circle(screen, current_color, (int(self.pos.x), int(self.pos.y)), self.radius)
-        pygame.draw.rect(screen, current_color, body_rect)
-        
-        # Eyes
-        eye_y = self.pos.y - self.radius / 4
-        eye_l_x = self.pos.x - self.radius / 2.5
-        eye_r_x = self.pos.x + self.radius / 2.5
-        eye_radius = self.radius / 4
-        pygame.draw.circle(screen, WHITE, (int(eye_l_x), int(eye_y)), int(eye_radius))
-        pygame.draw.circle(screen, WHITE, (int(eye_r_x), int(eye_y)), int(eye_radius))
-
-        # Pupils
-        pupil_offset = self.direction * eye_radius * 0.6
-        pupil_radius = eye_radius / 2
-        pygame.draw.circle(screen, BLACK, (int(eye_l_x + pupil_offset.x), int(eye_y + pupil_offset.y)), int(pupil_radius))
-        pygame.draw.circle(screen, BLACK, (int(eye_r_x + pupil_offset.x), int(eye_y + pupil_offset.y)), int(pupil_radius))
-
-
-    def can_move(self, pos, direction):
-        check_pos = pos + direction * GRID_SIZE
-        grid_x, grid_y = get_grid_pos(check_pos)
-        return not is_wall((grid_x, grid_y))
-
-    def move(self):
-        if self.state == "FRIGHTENED": self.speed = GHOST_FRIGHTENED_SPEED
-        else: self.speed = GHOST_SPEED
-
-        is_on_grid_x = abs(self.pos.x % GRID_SIZE - (GRID_SIZE / 2)) < self.speed
-        is_on_grid_y = abs((self.pos.y - MAZE_TOP_OFFSET) % GRID_SIZE - (GRID_SIZE / 2)) < self.speed
-
-        if is_on_grid_x and is_on_grid_y:
-            current_grid_pos_pixels = pygame.Vector2(
-                (int(self.pos.x / GRID_SIZE) * GRID_SIZE) + GRID_SIZE / 2,
-                (int((self.pos.y - MAZE_TOP_OFFSET)/ GRID_SIZE) * GRID_SIZE) + GRID_SIZE / 2 + MAZE_TOP_OFFSET )
-            
-            possible_directions = [d for d in [pygame.Vector2(1,0), pygame.Vector2(-1,0), pygame.Vector2(0,1), pygame.Vector2(0,-1)] if self.can_move(current_grid_pos_pixels, d)]
-            
-            if len(possible_directions) > 1 and self.direction * -1 in possible_directions:
-                possible_directions.remove(self.direction * -1)
-
-            if not self.can_move(current_grid_pos_pixels, self.direction) or (len(possible_directions) > 1 and random.random() < 0.2):
-                self.pos = current_grid_pos_pixels
-                if possible_directions: self.direction = random.choice(possible_directions)
-        
-        self.pos += self.direction * self.speed
-
-# --- 펠렛 클래스 ---
-class Pellet:
-    def __init__(self, x, y, is_power=False):
-        self.pos = pygame.Vector2(x, y)
-        self.is_power = is_power
-        self.radius = 6 if is_power else 3
-        self.rect = pygame.Rect(self.pos.x - self.radius, self.pos.y - self.radius, self.radius * 2, self.radius * 2)
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, PELLET_COLOR, (int(self.pos.x), int(self.pos.y)), self.radius)
+            color = FRIGHTENED_COLOR
+    frame = ghost_frames[(color, (int(ghost.direction.x), int(ghost.direction.y)))]
+    screen.blit(frame, (int(ghost.pos.x) - ghost.radius - offset[0], int(ghost.pos.y) - ghost.radius - offset[1]))
+
+# --- 펠렛 ---
+PELLET_RADIUS = {PELLET: 3, POWER_PELLET: 6}
+
+def pellet_center(x, y):
+    return x * GRID_SIZE + GRID_SIZE // 2, y * GRID_SIZE + MAZE_TOP_OFFSET + GRID_SIZE // 2
+
+def draw_pellet(surface, x, y, kind):
+    pygame.draw.circle(surface, PELLET_COLOR, pellet_center(x, y), PELLET_RADIUS[kind])
+
+def draw_tile(surface, left, top, tile):
+    """벽이나 고스트 문 한 칸을 (left, top) 픽셀에 그립니다."""
+    if tile == WALL:
+        pygame.draw.rect(surface, BLUE, (left, top, GRID_SIZE, GRID_SIZE))
+    elif tile == GATE:
+        # 고스트 문은 가운데 가로 막대로 표시합니다.
+        pygame.draw.rect(surface, GATE_COLOR, (left, top + GRID_SIZE // 2 - 2, GRID_SIZE, 4))
+
+def erase_pellet(surface, x, y, kind):
+    center_x, center_y = pellet_center(x, y)
+    radius = PELLET_RADIUS[kind]
+    pygame.draw.rect(surface, BLACK, (center_x - radius, center_y - radius, radius * 2, radius * 2))
 
 # --- 그리기 함수 ---
+# 벽과 펠렛은 각각 미리 그려 둔 레이어에 담아 두고, 프레임마다 두 번의 blit으로 그립니다.
 def draw_game_elements():
-    draw_maze()
-    for pellet in pellets: pellet.draw(screen)
-    player.draw(screen)
-    for ghost in ghosts: ghost.draw(screen)
+    if MEGA:
+        draw_mega_elements()
+        return
+    screen.blit(maze_layer, (0, 0))
+    screen.blit(pellet_layer, (0, 0))
+    draw_player(screen, game.player)
+    for ghost in game.ghosts: draw_ghost(screen, ghost, game.frightened_timer)
     draw_ui()
 
-def draw_maze():
-    for y, row in enumerate(maze):
-        for x, char in enumerate(row):
-            if char == 'W':
-                pygame.draw.rect(screen, BLUE, (x * GRID_SIZE, y * GRID_SIZE + MAZE_TOP_OFFSET, GRID_SIZE, GRID_SIZE))
+def build_maze_layer():
+    """벽을 한 번만 그려 둔 배경 레이어를 만듭니다."""
+    layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    layer.fill(BLACK)
+    width = game.maze.width
+    for cell, tile in enumerate(game.maze.level.tiles):
+        if tile != OPEN:
+            draw_tile(layer, (cell % width) * GRID_SIZE, (cell // width) * GRID_SIZE + MAZE_TOP_OFFSET, tile)
+    return layer
+
+def build_pellet_layer():
+    """남은 펠렛을 그려 둔 레이어를 만듭니다. 검은색은 투명하게 처리되어 벽 레이어 위에 겹칩니다."""
+    layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    layer.fill(BLACK)
+    layer.set_colorkey(BLACK)
+    width = game.maze.width
+    for cell, kind in enumerate(game.pellet_grid):
+        if kind:
+            draw_pellet(layer, cell % width, cell // width, kind)
+    return layer
+
+# --- 큰 미로: 카메라와 조각 캐시 ---
+# 미로 전체를 한 장에 그리면 너무 크므로, CHUNK_TILES 칸 단위 조각을 필요할 때 그려 LRU 캐시에 둡니다.
+# 프레임마다 보이는 조각 몇 장과, 공간 해시로 찾은 화면 안의 고스트만 그립니다.
+CHUNK_TILES = 16
+CHUNK_SIZE = CHUNK_TILES * GRID_SIZE
+CHUNK_CACHE_SIZE = 64
+chunk_cache = SurfaceCache(CHUNK_CACHE_SIZE)
+
+def build_chunk(cx, cy):
+    """(cx, cy)번 조각의 벽과 남은 펠렛을 그린 서피스"""
+    chunk = pygame.Surface((CHUNK_SIZE, CHUNK_SIZE)).convert()
+    chunk.fill(BLACK)
+    maze, pellets = game.maze, game.pellet_grid
+    tiles, width = maze.level.tiles, maze.width
+    left, top = cx * CHUNK_TILES, cy * CHUNK_TILES
+    for y in range(top, min(top + CHUNK_TILES, maze.height)):
+        for x in range(left, min(left + CHUNK_TILES, width)):
+            cell = y * width + x
+            px, py = (x - left) * GRID_SIZE, (y - top) * GRID_SIZE
+            if tiles[cell] != OPEN:
+                draw_tile(chunk, px, py, tiles[cell])
+            elif pellets[cell]:
+                pygame.draw.circle(chunk, PELLET_COLOR, (px + GRID_SIZE // 2, py + GRID_SIZE // 2), PELLET_RADIUS[pellets[cell]])
+    return chunk
+
+def get_chunk(cx, cy):
+    chunk = chunk_cache.get((cx, cy))
+    if chunk is None:
+        chunk = chunk_cache.put((cx, cy), build_chunk(cx, cy))
+    return chunk
+
+def erase_chunk_pellet(cell, kind):
+    """먹힌 펠렛을, 그 칸의 조각이 캐시에 있을 때만 지웁니다. 없으면 나중에 남은 펠렛으로 새로 그립니다."""
+    x, y = cell % game.maze.width, cell // game.maze.width
+    chunk = chunk_cache.get((x // CHUNK_TILES, y // CHUNK_TILES))
+    if chunk is not None:
+        radius = PELLET_RADIUS[kind]
+        center_x = (x % CHUNK_TILES) * GRID_SIZE + GRID_SIZE // 2
+        center_y = (y % CHUNK_TILES) * GRID_SIZE + GRID_SIZE // 2
+        pygame.draw.rect(chunk, BLACK, (center_x - radius, center_y - radius, radius * 2, radius * 2))
+
+def camera_offset():
+    """플레이어를 화면 가운데에 두는 카메라 위치(픽셀). 미로 밖이 보이지 않게 가장자리에서 멈춥니다."""
+    view_width, view_height = SCREEN_WIDTH, SCREEN_HEIGHT - MAZE_TOP_OFFSET
+    maze, pos = game.maze, game.player.pos
+    x = min(max(pos.x - view_width / 2, 0), max(maze.width * GRID_SIZE - view_width, 0))
+    y = min(max(pos.y - MAZE_TOP_OFFSET - view_height / 2, 0), max(maze.height * GRID_SIZE - view_height, 0))
+    return int(x), int(y)
+
+def draw_mega_elements():
+    offset_x, offset_y = offset = camera_offset()
+    view_height = SCREEN_HEIGHT - MAZE_TOP_OFFSET
+    screen.fill(BLACK)
+    for cy in range(offset_y // CHUNK_SIZE, (offset_y + view_height - 1) // CHUNK_SIZE + 1):
+        for cx in range(offset_x // CHUNK_SIZE, (offset_x + SCREEN_WIDTH - 1) // CHUNK_SIZE + 1):
+            screen.blit(get_chunk(cx, cy), (cx * CHUNK_SIZE - offset_x, MAZE_TOP_OFFSET + cy * CHUNK_SIZE - offset_y))
+    draw_player(screen, game.player, offset)
+    # 화면에 걸친 칸보다 한 칸 넓게 찾아야 칸 경계에 걸친 고스트도 그려집니다.
+    left, top = offset_x // GRID_SIZE - 1, offset_y // GRID_SIZE - 1
+    right, bottom = (offset_x + SCREEN_WIDTH) // GRID_SIZE + 1, (offset_y + view_height) // GRID_SIZE + 1
+    for ghost in game.ghost_grid.in_area(left, top, right, bottom):
+        draw_ghost(screen, ghost, game.frightened_timer, offset)
+    screen.fill(BLACK, (0, 0, SCREEN_WIDTH, MAZE_TOP_OFFSET)) # 점수 줄로 넘어온 부분을 지웁니다.
+    draw_ui()
 
 def draw_ui():
-    score_text = font.render(f"점수: {score}", True, WHITE)
+    score_text = render_text(font, f"점수: {game.score}", WHITE)
     screen.blit(score_text, (10, 10))
+    if time_scale != 1:
+        speed_text = render_text(font, "최대 속도" if time_scale is None else f"x{time_scale:g}", YELLOW)
+        screen.blit(speed_text, speed_text.get_rect(topright=(SCREEN_WIDTH - 10, 10)))
+
+def build_start_screen():
+    start_screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    start_screen.fill(BLACK)
+    title = render_text(big_font, "팩맨", YELLOW)
+    prompt = render_text(font, "시작하려면 아무 키나 누르세요.", WHITE)
+    start_screen.blit(title, title.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 50)))
+    start_screen.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 50)))
+    return start_screen
 
 def draw_start_screen():
-    screen.fill(BLACK)
-    title = big_font.render("팩맨", True, YELLOW)
-    prompt = font.render("시작하려면 아무 키나 누르세요.", True, WHITE)
-    screen.blit(title, title.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 50)))
-    screen.blit(prompt, prompt.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 50)))
+    # 시작 화면은 한 번만 만들어 두고 통째로 blit합니다.
+    screen.blit(get_prebuilt("pacman_start", build_start_screen), (0, 0))
+
+def build_end_screen(message, final_score):
+    # 글자가 검은 상자보다 넓거나 아래로 삐져나와도 잘리지 않도록 화면 크기의 투명 표면에 그립니다.
+    end_screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+    end_screen.fill(BLACK, (SCREEN_WIDTH/4, SCREEN_HEIGHT/2 - (SCREEN_HEIGHT/6), SCREEN_WIDTH/2, SCREEN_HEIGHT/3))
+    end_text = render_text(big_font, message, RED if message == "GAME OVER" else YELLOW)
+    score_text = render_text(font, f"총점: {final_score}", WHITE)
+    restart_text = render_text(font, "다시 시작하려면 아무 키나 누르세요.", WHITE)
+    end_screen.blit(end_text, end_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 50)))
+    end_screen.blit(score_text, score_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 20)))
+    end_screen.blit(restart_text, restart_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 70)))
+    return end_screen.convert_alpha()
 
 def draw_end_screen(message):
-    pygame.draw.rect(screen, BLACK, (SCREEN_WIDTH/4, SCREEN_HEIGHT/2 - (SCREEN_HEIGHT/6), SCREEN_WIDTH/2, SCREEN_HEIGHT/3))
-    end_text = big_font.render(message, True, RED if message == "GAME OVER" else YELLOW)
-    score_text = font.render(f"총점: {score}", True, WHITE)
-    restart_text = font.render("다시 시작하려면 아무 키나 누르세요.", True, WHITE)
-    screen.blit(end_text, end_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 - 50)))
-    screen.blit(score_text, score_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 20)))
-    screen.blit(restart_text, restart_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 70)))
+    end_screen = get_prebuilt(("pacman_end", message, game.score), lambda: build_end_screen(message, game.score))
+    screen.blit(end_screen, (0, 0))
 
 # --- 게임 상태 관리 ---
+KEY_DIRECTIONS = ((pygame.K_LEFT, (-1, 0)), (pygame.K_RIGHT, (1, 0)), (pygame.K_UP, (0, -1)), (pygame.K_DOWN, (0, 1)))
+
+# --- 배속 ---
+# 게임 시간은 (지난 실제 시간 x 배속)만큼 진행합니다. None은 한 프레임 동안 틱을 최대한 많이 돌립니다.
+SPEED_KEYS = {pygame.K_1: 1, pygame.K_2: 4, pygame.K_3: 100, pygame.K_4: None}
+MAX_FRAME_TIME = 0.25 # 창을 끌거나 멈췄다가 돌아왔을 때 따라잡을 최대 실제 시간(초)
+
+def parse_speed(text):
+    """--speed 값을 배속으로 바꿉니다. max는 None, 그 밖에는 0보다 큰 수여야 합니다."""
+    if text == "max":
+        return None
+    try:
+        scale = float(text)
+    except ValueError:
+        scale = 0
+    if not (scale > 0 and math.isfinite(scale)):
+        print("--speed에는 0보다 큰 배속이나 max를 주세요.")
+        sys.exit(1)
+    return scale
+
+time_scale = parse_speed(sys.argv[sys.argv.index("--speed") + 1]) if "--speed" in sys.argv else 1
+
+def advance_game(frame_time):
+    """이번 프레임만큼 게임을 진행합니다."""
+    action = read_input()
+    if time_scale is None:
+        # 최대 속도: 화면 한 프레임 분량의 실제 시간 동안 틱을 계속 돌립니다.
+        deadline = time.perf_counter() + 1 / FPS
+        while not game.done and time.perf_counter() < deadline:
+            game.advance(1 / FPS, action) # 펠렛 기록이 틱마다 지워지지 않도록 step() 대신 씁니다.
+    else:
+        game.advance(min(frame_time, MAX_FRAME_TIME) * time_scale, action)
+
 game_state = "START"
-score = 0
-pellets = []
-ghosts = []
-frightened_mode_timer = 0
-player = Player(GRID_SIZE * 1.5, MAZE_TOP_OFFSET + GRID_SIZE * 1.5)
+level_index = 0
+game = None
+maze_layer = None
+pellet_layer = None
+
+def get_maze(index):
+    """레벨의 이동 표는 처음 플레이할 때 한 번만 만듭니다."""
+    if index not in mazes:
+        if levels[index] is DEFAULT_MAZE.level:
+            mazes[index] = DEFAULT_MAZE
+        else:
+            mazes[index] = Maze(levels[index], MEGA_FIELD_RADIUS if MEGA else None)
+    return mazes[index]
 
 def reset_game():
-    global score, maze, pellets, ghosts, frightened_mode_timer
-    score = 0
-    frightened_mode_timer = 0
-    maze = original_maze.copy()
-    pellets.clear()
-    ghosts.clear()
-    player.reset()
-
-    ghost_colors = [RED, PINK, CYAN, ORANGE]
-    for y, row in enumerate(maze):
-        for x, char in enumerate(row):
-            pos_x, pos_y = x * GRID_SIZE + GRID_SIZE / 2, y * GRID_SIZE + MAZE_TOP_OFFSET + GRID_SIZE / 2
-            if char == '.': pellets.append(Pellet(pos_x, pos_y))
-            elif char == 'P': pellets.append(Pellet(pos_x, pos_y, is_power=True))
-            elif char == 'G' and len(ghosts) < 4:
-                ghosts.append(Ghost(pos_x, pos_y, ghost_colors.pop(0)))
-    for ghost in ghosts: ghost.reset()
+    global game, maze_layer, pellet_layer
+    maze = get_maze(level_index)
+    if game is None or game.maze is not maze:
+        game = GameState(ghost_count=GHOST_COUNT, maze=maze)
+        if not MEGA:
+            maze_layer = build_maze_layer()
+    else:
+        game.reset()
+    if MEGA:
+        chunk_cache.clear() # 조각은 보일 때 남은 펠렛으로 다시 그립니다.
+    else:
+        pellet_layer = build_pellet_layer()
+
+def read_input():
+    """누르고 있는 방향키를 GameState.step에 넘길 방향으로 바꿉니다."""
+    keys = pygame.key.get_pressed()
+    for key, direction in KEY_DIRECTIONS:
+        if keys[key]:
+            return direction
+    return None
 
 # --- 게임 루프 ---
 running = True
+frame_time = 0
 reset_game()
 
 while running:
+    profiler.begin_frame()
     for event in pygame.event.get():
         if event.type == pygame.QUIT: running = False
         if event.type == pygame.KEYDOWN:
-            if game_state == "START": game_state = "PLAYING"
+            if game_state == "PLAYING" and event.key in SPEED_KEYS: time_scale = SPEED_KEYS[event.key]
+            elif game_state == "START": game_state = "PLAYING"
             elif game_state in ["GAME_OVER", "WIN"]:
+                if game_state == "WIN": level_index = (level_index + 1) % len(levels)
                 reset_game()
                 game_state = "START"
 
-    screen.fill(BLACK)
+    profiler.mark("input")
 
+    # 모든 화면이 화면 전체를 덮는 서피스를 먼저 blit하므로 따로 지우지 않습니다.
     if game_state == "START":
         draw_start_screen()
     elif game_state == "PLAYING":
-        if frightened_mode_timer > 0:
-            frightened_mode_timer -= 1
-            if frightened_mode_timer == 0:
-                for ghost in ghosts: ghost.state = "CHASE"
-
-        player.update()
-        player.move()
-        for ghost in ghosts: ghost.move()
-
-        for pellet in pellets[:]:
-            if player.rect.colliderect(pellet.rect):
-                pellets.remove(pellet)
-                if pellet.is_power:
-                    score += 50
-                    frightened_mode_timer = FRIGHTENED_DURATION
-                    for ghost in ghosts: ghost.state = "FRIGHTENED"
-                else: score += 10
-        
-        for ghost in ghosts:
-            if player.rect.colliderect(ghost.rect):
-                if ghost.state == "FRIGHTENED":
-                    score += 200
-                    ghost.reset()
-                else:
-                    game_state = "GAME_OVER"
-                    break
-        
-        if not pellets: game_state = "WIN"
+        advance_game(frame_time) # 충돌 판정도 GameState.step 안에서 합니다.
+        profiler.mark("update")
+        width = game.maze.width
+        for cell, kind in game.eaten:
+            # 먹힌 펠렛만 레이어에서 지웁니다.
+            if MEGA:
+                erase_chunk_pellet(cell, kind)
+            else:
+                erase_pellet(pellet_layer, cell % width, cell // width, kind)
+        game.eaten.clear()
+        if game.status == GAME_OVER: game_state = "GAME_OVER"
+        elif game.status == WIN: game_state = "WIN"
         draw_game_elements()
 
     elif game_state in ["GAME_OVER", "WIN"]:
         draw_game_elements() # Draw the final game state behind the message
         draw_end_screen("GAME OVER" if game_state == "GAME_OVER" else "승리하셨습니다!")
 
+    profiler.draw_hud(screen)
+    profiler.mark("draw")
     pygame.display.flip()
-    clock.tick(FPS)
+    profiler.mark("flip")
+    # 최대 속도에서는 프레임 수를 제한하지 않습니다. 이동은 실제로 지난 시간만큼만 진행합니다.
+    frame_time = (clock.tick() if time_scale is None else clock.tick(FPS)) / 1000
+    profiler.mark("wait")
 
 pygame.quit()
 sys.exit()
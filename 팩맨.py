@@ -1,11 +1,26 @@
 import tkinter as tk
 import random
+import sys
+import time
+from array import array
+from collections import deque
+from itertools import permutations
+
+from pacman_level import WALL, GATE, load_level_pack
 
 # --- 상수 정의 ---
 TILE_SIZE = 24
-GAME_SPEED_MS = 150
+GAME_SPEED_MS = 150 # 게임 규칙의 틱 간격
+FRAME_MS = 16 # 화면(캐릭터 위치) 갱신 간격. 틱 사이는 보간해서 부드럽게 움직입니다.
+MAX_CATCHUP_TICKS = 5 # 크게 밀렸을 때 한 번에 따라잡는 최대 틱 수
+TICK_SECONDS = GAME_SPEED_MS / 1000
+FRAME_SECONDS = FRAME_MS / 1000
+
+GHOST_COLORS = ["red", "pink", "cyan", "orange"]
+GHOST_SPREAD = 3 # 유령마다 목표를 팩맨 칸에서 칸 번호로 이만큼씩 (0, -3, +3, -6, +6, ...) 어긋나게 잡습니다.
+NO_PATH = 0xFFFF # 거리표에서 '닿을 수 없음'
 
-# 맵 정의: 1 = 벽, 0 = 길 (점), 2 = 팩맨, 4 = 유령, 5 = 유령 문
+# 맵 정의: 1 = 벽, 0 = 길 (점), 2 = 팩맨, 3 = 빈 길, 4 = 유령 (여러 개 가능), 5 = 유령 문
 GAME_MAP = [
     [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
     [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1],
@@ -29,20 +44,43 @@ GAME_MAP = [
     [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
 ]
 
+def level_to_game_map(level):
+    """컴파일된 레벨(pacman_level)을 위 맵 형식으로 바꿉니다. 고스트 시작 칸마다 유령이 하나씩 나옵니다."""
+    game_map = []
+    for r in range(level.height):
+        row = []
+        for c in range(level.width):
+            cell = r * level.width + c
+            if level.tiles[cell] == WALL:
+                row.append(1)
+            elif level.tiles[cell] == GATE:
+                row.append(5)
+            elif cell == level.player_start:
+                row.append(2)
+            elif cell in level.ghost_starts:
+                row.append(4)
+            else:
+                row.append(0 if level.pellets[cell] else 3)
+        game_map.append(row)
+    return game_map
+
 DIRECTIONS = ["Up", "Left", "Down", "Right"]  # 우선순위 (팩맨 규칙)
 DIR_OFFSET = {"Left": (0, -1), "Right": (0, 1), "Up": (-1, 0), "Down": (1, 0)}
+REVERSE = {"Left": "Right", "Right": "Left", "Up": "Down", "Down": "Up"}
+DIRECTION_ORDERS = list(permutations(DIRECTIONS)) # 유령마다 다른 동점 처리 순서 (24가지)
 
 class PacManGame:
-    def __init__(self, root):
+    def __init__(self, root, game_map=GAME_MAP):
         self.root = root
+        self.game_map = game_map
         self.root.title("Tkinter Pac-Man")
 
         self.score = 0
         self.dots_remaining = 0
         self.game_over = False
 
-        self.map_height = len(GAME_MAP)
-        self.map_width = len(GAME_MAP[0])
+        self.map_height = len(game_map)
+        self.map_width = len(game_map[0])
         self.canvas_width = self.map_width * TILE_SIZE
         self.canvas_height = self.map_height * TILE_SIZE
 
@@ -58,17 +96,31 @@ class PacManGame:
         self.game_running = False
         self.game_over_text_id = None
 
-        self.map = [row[:] for row in GAME_MAP]
-        self.dots = {}
+        self.map = [row[:] for row in self.game_map]
+        self.dot_items = {} # (행, 열) -> 점 캔버스 항목. 재시작해도 지우지 않고 숨겼다가 다시 보입니다.
+        self.dots = {} # 아직 먹지 않은 점
+        self.player_start = None
+        self.ghost_starts = []
         self.player_pos = None
-        self.ghost_pos = None
+        self.ghost_positions = []
+        self.player_prev = None # 직전 틱의 위치 (보간용)
+        self.ghost_prev = []
+        self.item_coords = {} # 캔버스 항목별 마지막 좌표. 같으면 coords를 다시 부르지 않습니다.
+        self.next_tick = 0.0
+        self.next_frame = 0.0
         self.player_direction = "Right"
         self.player_next_direction = "Right"
         self.player_id = None
-        self.ghost_id = None
-        self.ghost_direction = "Up"
+        self.ghost_ids = []
+        self.ghost_directions = []
+        self.cell_index = {} # 유령이 갈 수 있는 칸 -> 거리표 번호
+        self.cell_exits = [] # 칸 번호마다 (방향, 이웃 칸 번호) 목록
+        self.ghost_offsets = [] # 유령마다 목표 칸 번호를 팩맨 칸에서 어긋나게 할 양
+        self.ghost_ranks = [] # 유령마다 {방향: 거리가 같을 때의 순위}
+        self.path_table = array('H')
 
         self.draw_map()
+        self.restore_board()
 
         self.root.bind("<KeyPress-Left>", self.key_pressed)
         self.root.bind("<KeyPress-Right>", self.key_pressed)
@@ -83,39 +135,90 @@ class PacManGame:
         y2 = (r + 1) * TILE_SIZE - pad
         return x1, y1, x2, y2
 
-    def _move_canvas_item(self, item_id, r, c):
-        self.canvas.coords(item_id, *self._cell_bbox(r, c))
-
-    def _create_entity(self, r, c, kind):
+    def _place_item(self, item_id, prev, pos, alpha):
+        """prev 칸과 pos 칸 사이 alpha(0~1) 지점에 항목을 놓습니다."""
+        (r0, c0), (r1, c1) = prev, pos
+        if abs(r1 - r0) + abs(c1 - c0) > 1:
+            alpha = 1.0 # 터널로 반대편에 나타날 때는 보간하지 않습니다.
+        bbox = tuple(round(v) for v in self._cell_bbox(r0 + (r1 - r0) * alpha, c0 + (c1 - c0) * alpha))
+        if self.item_coords.get(item_id) != bbox:
+            self.canvas.coords(item_id, *bbox)
+            self.item_coords[item_id] = bbox
+
+    def _create_entity(self, r, c, kind, color="red"):
         bbox = self._cell_bbox(r, c)
         if kind == "player":
             return self.canvas.create_oval(*bbox, fill="yellow", outline="")
         if kind == "ghost":
-            return self.canvas.create_rectangle(*bbox, fill="red", outline="")
+            return self.canvas.create_rectangle(*bbox, fill=color, outline="")
         return None
 
     # --- 맵/렌더링 ---
+    # 캔버스는 항목 수가 많을수록 느려지므로, 벽은 합친 사각형 몇 개로 그리고
+    # 점과 캐릭터 항목은 처음에 한 번만 만들어 재시작할 때 그대로 다시 씁니다.
+    def wall_rects(self):
+        """벽 칸을 행마다 가로 구간으로 묶고, 바로 아래 행에 같은 구간이 있으면 한 사각형으로 이어 붙입니다.
+
+        (위 행, 왼쪽 열, 아래 행 + 1, 오른쪽 열 + 1) 목록을 돌려줍니다.
+        """
+        rects = []
+        open_runs = {} # (왼쪽 열, 오른쪽 열 + 1) -> 시작 행
+        for r in range(self.map_height + 1):
+            runs = set()
+            if r < self.map_height:
+                row, c = self.map[r], 0
+                while c < self.map_width:
+                    if row[c] != 1:
+                        c += 1
+                        continue
+                    start = c
+                    while c < self.map_width and row[c] == 1:
+                        c += 1
+                    runs.add((start, c))
+            # 이번 행에서 끊긴 구간은 사각형으로 닫습니다.
+            for run in [run for run in open_runs if run not in runs]:
+                rects.append((open_runs.pop(run), run[0], r, run[1]))
+            for run in runs:
+                open_runs.setdefault(run, r)
+        return rects
+
     def draw_map(self):
+        """벽, 점, 팩맨, 유령 항목을 만듭니다. 처음에 한 번만 부릅니다."""
+        for top, left, bottom, right in self.wall_rects():
+            self.canvas.create_rectangle(left * TILE_SIZE, top * TILE_SIZE, right * TILE_SIZE, bottom * TILE_SIZE,
+                                         fill="blue", outline="", tags="wall")
         for r in range(self.map_height):
             for c in range(self.map_width):
-                x1, y1, x2, y2 = c * TILE_SIZE, r * TILE_SIZE, (c + 1) * TILE_SIZE, (r + 1) * TILE_SIZE
                 cell = self.map[r][c]
-
-                if cell == 1:
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="blue", outline="")
-                elif cell == 0:
-                    dot_bbox = (x1 + TILE_SIZE // 2 - 2, y1 + TILE_SIZE // 2 - 2,
-                                x1 + TILE_SIZE // 2 + 2, y1 + TILE_SIZE // 2 + 2)
-                    dot_id = self.canvas.create_oval(*dot_bbox, fill="white", outline="")
-                    self.dots[(r, c)] = dot_id
-                    self.dots_remaining += 1
+                if cell == 0:
+                    x, y = c * TILE_SIZE + TILE_SIZE // 2, r * TILE_SIZE + TILE_SIZE // 2
+                    self.dot_items[(r, c)] = self.canvas.create_oval(x - 2, y - 2, x + 2, y + 2, fill="white",
+                                                                     outline="", tags="dot")
                 elif cell == 2:
-                    self.player_pos = [r, c]
-                    self.player_id = self._create_entity(r, c, "player")
+                    self.player_start = (r, c)
                 elif cell == 4:
-                    self.ghost_pos = [r, c]
-                    self.ghost_id = self._create_entity(r, c, "ghost")
+                    self.ghost_starts.append((r, c))
                 # cell == 5 : invisible gate, do nothing
+        # 캐릭터는 점보다 나중에 만들어 점 위에 보이게 합니다.
+        self.player_id = self._create_entity(*self.player_start, "player")
+        self.ghost_ids = [self._create_entity(r, c, "ghost", GHOST_COLORS[i % len(GHOST_COLORS)])
+                          for i, (r, c) in enumerate(self.ghost_starts)]
+        self.build_path_table()
+        self.ghost_offsets = [(i + 1) // 2 * GHOST_SPREAD * (-1 if i % 2 else 1) for i in range(len(self.ghost_starts))]
+        self.ghost_ranks = [{d: rank for rank, d in enumerate(DIRECTION_ORDERS[i % len(DIRECTION_ORDERS)])}
+                            for i in range(len(self.ghost_starts))]
+
+    def restore_board(self):
+        """숨긴 점을 모두 다시 보이게 하고 캐릭터를 시작 칸으로 옮깁니다. 캔버스 항목은 새로 만들지 않습니다."""
+        self.canvas.itemconfigure("dot", state=tk.NORMAL)
+        self.dots = dict(self.dot_items)
+        self.dots_remaining = len(self.dots)
+        self.player_pos = list(self.player_start)
+        self.ghost_positions = [list(start) for start in self.ghost_starts]
+        self.ghost_directions = ["Up"] * len(self.ghost_starts)
+        self.player_prev = self.player_start
+        self.ghost_prev = list(self.ghost_starts)
+        self.render()
 
     # --- 입력 ---
     def key_pressed(self, event):
@@ -123,17 +226,49 @@ class PacManGame:
             self.player_next_direction = event.keysym
 
     # --- 게임 루프 ---
+    # 틱과 프레임의 다음 시각을 절대 시각으로 정해 두므로, 처리 시간이 간격에 더해져 점점 느려지지 않습니다.
+    # 늦게 깨어나면 밀린 틱을 한꺼번에 진행하고, 화면은 FRAME_MS마다 두 틱 사이를 보간해 그립니다.
     def game_loop(self):
         if self.game_over or not self.game_running:
             return
 
+        now = time.perf_counter()
+        ticks = 0
+        while self.game_running and now >= self.next_tick:
+            if ticks == MAX_CATCHUP_TICKS:
+                self.next_tick = now + TICK_SECONDS # 너무 밀렸으면 따라잡기를 포기합니다.
+                break
+            self.tick()
+            self.next_tick += TICK_SECONDS
+            ticks += 1
+        self.render(now)
+        if not self.game_running:
+            return
+
+        self.next_frame += FRAME_SECONDS
+        if self.next_frame <= now:
+            self.next_frame = now + FRAME_SECONDS
+        self.root.after(max(0, round((self.next_frame - now) * 1000)), self.game_loop)
+
+    def tick(self):
+        """게임 규칙을 한 틱 진행합니다."""
+        self.player_prev = tuple(self.player_pos)
+        self.ghost_prev = [tuple(pos) for pos in self.ghost_positions]
         self.move_player()
-        self.move_ghost()
+        self.move_ghosts()
         self.check_collisions()
         self.update_score()
         self.check_win_loss()
 
-        self.root.after(GAME_SPEED_MS, self.game_loop)
+    def render(self, now=None):
+        """캐릭터를 직전 틱 위치에서 현재 위치로 가는 도중에 그립니다. 게임이 멈춰 있으면 현재 위치에 그립니다."""
+        if now is None or not self.game_running:
+            alpha = 1.0
+        else:
+            alpha = min(max((now - (self.next_tick - TICK_SECONDS)) / TICK_SECONDS, 0.0), 1.0)
+        self._place_item(self.player_id, self.player_prev, self.player_pos, alpha)
+        for ghost_id, prev, pos in zip(self.ghost_ids, self.ghost_prev, self.ghost_positions):
+            self._place_item(ghost_id, prev, pos, alpha)
 
     # --- 이동/충돌 ---
     def get_next_pos(self, r, c, direction):
@@ -164,51 +299,79 @@ class PacManGame:
         next_r, next_c = self.get_next_pos(r, c, self.player_direction)
         if not self.is_wall(next_r, next_c):
             self.player_pos = [next_r, next_c]
-            self._move_canvas_item(self.player_id, next_r, next_c)
-
-    def get_reverse_direction(self, direction):
-        return {"Left": "Right", "Right": "Left", "Up": "Down", "Down": "Up"}.get(direction)
-
-    def move_ghost(self):
-        pr, pc = self.player_pos
-        gr, gc = self.ghost_pos
-
-        reverse_dir = self.get_reverse_direction(self.ghost_direction)
-        candidates = []
-
-        for direction in DIRECTIONS:
-            if direction == reverse_dir:
-                continue
-            nr, nc = self.get_next_pos(gr, gc, direction)
-            if 0 <= nr < self.map_height and 0 <= nc < self.map_width and self.map[nr][nc] != 1:
-                candidates.append((direction, nr, nc))
-
-        if not candidates:
-            nr, nc = self.get_next_pos(gr, gc, reverse_dir)
-            if 0 <= nr < self.map_height and 0 <= nc < self.map_width and self.map[nr][nc] != 1:
-                candidates.append((reverse_dir, nr, nc))
-            if not candidates:
-                return
-
-        best = candidates[0]
-        min_dist = (best[1] - pr) ** 2 + (best[2] - pc) ** 2
-
-        for cand in candidates[1:]:
-            dist = (cand[1] - pr) ** 2 + (cand[2] - pc) ** 2
-            if dist < min_dist or (dist == min_dist and DIRECTIONS.index(cand[0]) < DIRECTIONS.index(best[0])):
-                best, min_dist = cand, dist
-
-        self.ghost_direction = best[0]
-        self.ghost_pos = [best[1], best[2]]
-        self._move_canvas_item(self.ghost_id, best[1], best[2])
 
     def check_collisions(self):
         pos = tuple(self.player_pos)
         if pos in self.dots:
-            self.canvas.delete(self.dots.pop(pos))
+            self.canvas.itemconfigure(self.dots.pop(pos), state=tk.HIDDEN)
             self.score += 10
             self.dots_remaining -= 1
 
+    # --- 유령 길찾기 ---
+    def build_path_table(self):
+        """유령이 갈 수 있는 모든 칸 쌍 사이의 최단 거리를 미리 구해 둡니다.
+
+        유령 문(5)과 터널(get_next_pos)도 유령이 실제로 움직이는 대로 따라갑니다.
+        목표 칸마다 들어오는 길을 거꾸로 BFS 합니다. 표는 (칸 수 x 칸 수) x 2바이트이고,
+        유령 한 마리의 이동은 출구 몇 개의 거리를 표에서 읽는 것으로 끝납니다.
+        """
+        cells = [(r, c) for r in range(self.map_height) for c in range(self.map_width) if self.map[r][c] != 1]
+        index = {cell: i for i, cell in enumerate(cells)}
+        exits = [[] for _ in cells]
+        incoming = [[] for _ in cells]
+        for i, (r, c) in enumerate(cells):
+            for direction in DIRECTIONS:
+                n = index.get(self.get_next_pos(r, c, direction))
+                if n is not None:
+                    exits[i].append((direction, n))
+                    incoming[n].append(i)
+
+        count = len(cells)
+        table = array('H', [NO_PATH]) * (count * count)
+        for target in range(count):
+            row = target * count
+            table[row + target] = 0
+            queue = deque([target])
+            while queue:
+                cell = queue.popleft()
+                step = table[row + cell] + 1
+                for n in incoming[cell]:
+                    if table[row + n] == NO_PATH:
+                        table[row + n] = step
+                        queue.append(n)
+        self.cell_index = index
+        self.cell_exits = exits
+        self.path_table = table
+
+    def move_ghosts(self):
+        """유령마다 되돌아가지 않는 출구 중 목표에 가장 가까운 쪽으로 한 칸 갑니다.
+
+        목표는 팩맨 칸 번호에 유령마다 다른 어긋남을 더한 칸(칸 수로 나눈 나머지)이라 통로 길이와 상관없이 서로 다르고,
+        거리가 같은 출구는 유령마다 다른 순서로 고릅니다. 그래서 같은 칸에 모인 유령도 서로 갈라집니다.
+        막다른 길에서만 되돌아갑니다. 유령 한 마리에 표 조회 몇 번이면 끝납니다.
+        """
+        index, table, count = self.cell_index, self.path_table, len(self.cell_index)
+        player = index.get(tuple(self.player_pos))
+        if player is None:
+            return
+        for i, (r, c) in enumerate(self.ghost_positions):
+            cell = index.get((r, c))
+            if cell is None:
+                continue
+            row = (player + self.ghost_offsets[i]) % count * count
+            ranks = self.ghost_ranks[i]
+            reverse = REVERSE[self.ghost_directions[i]]
+            exits = [(d, n) for d, n in self.cell_exits[cell] if d != reverse] or self.cell_exits[cell]
+            best = None
+            for direction, n in exits:
+                key = (table[row + n], ranks[direction])
+                if best is None or key < best[0]:
+                    best = (key, direction)
+            if best is None or best[0][0] == NO_PATH:
+                continue
+            self.ghost_directions[i] = best[1]
+            self.ghost_positions[i] = list(self.get_next_pos(r, c, best[1]))
+
     # --- UI/상태 ---
     def update_score(self):
         self.score_label.config(text=f"Score: {self.score}")
@@ -226,30 +389,37 @@ class PacManGame:
             self.canvas.delete(self.game_over_text_id)
             self.game_over_text_id = None
 
+        # 첫 틱은 바로 진행합니다.
+        self.next_tick = self.next_frame = time.perf_counter()
         self.game_loop()
 
     def reset_game(self):
-        self.canvas.delete("all")
+        # 벽과 점 항목은 그대로 두고, 점을 다시 보이게 하고 캐릭터만 제자리로 옮깁니다.
+        if self.game_over_text_id:
+            self.canvas.delete(self.game_over_text_id)
+            self.game_over_text_id = None
         self.score = 0
-        self.dots_remaining = 0
         self.game_over = False
         self.game_running = False
 
-        self.dots.clear()
-        self.player_pos = None
-        self.ghost_pos = None
         self.player_direction = "Right"
         self.player_next_direction = "Right"
-        self.ghost_direction = "Up"
-        self.game_over_text_id = None
-        self.map = [row[:] for row in GAME_MAP]
 
-        self.draw_map()
+        self.restore_board()
         self.update_score()
         self.start_button.config(text="START")
 
+    def caught_by_ghost(self):
+        """유령과 같은 칸에 있거나, 이번 틱에 서로 자리를 바꿔 스쳐 지나갔으면 잡힌 것입니다."""
+        player = tuple(self.player_pos)
+        for pos, prev in zip(self.ghost_positions, self.ghost_prev):
+            pos = tuple(pos)
+            if pos == player or (pos == self.player_prev and prev == player):
+                return True
+        return False
+
     def check_win_loss(self):
-        if self.player_pos == self.ghost_pos:
+        if self.caught_by_ghost():
             message, color = "GAME OVER", "red"
             self.game_over = True
         elif self.dots_remaining == 0:
@@ -267,6 +437,16 @@ class PacManGame:
 
 # --- 메인 실행 ---
 if __name__ == "__main__":
+    # 사용법: python 팩맨.py [--level 레벨팩 파일 [레벨 번호]]
+    game_map = GAME_MAP
+    if "--level" in sys.argv:
+        index = sys.argv.index("--level")
+        levels = load_level_pack(sys.argv[index + 1])
+        number = int(sys.argv[index + 2]) if len(sys.argv) > index + 2 and sys.argv[index + 2].isdigit() else 1
+        if not 1 <= number <= len(levels):
+            print(f"레벨 번호는 1~{len(levels)} 사이여야 합니다.")
+            sys.exit(1)
+        game_map = level_to_game_map(levels[number - 1])
     root = tk.Tk()
-    game = PacManGame(root)
+    game = PacManGame(root, game_map)
     root.mainloop()
\ No newline at end of file